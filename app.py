@@ -1,123 +1,282 @@
 import streamlit as st
 import datetime
 import os
+import re
+import time
 import io
+import uuid
 import numpy as np
-import tempfile
+
+from pipeline import load_audio, generate_minutes, minutes_to_docx
+from checkpoint import transcribe_resumable
+from audio_archive import archive, compact_segments
+from model_manager import manager, MODEL_SIZES
+from backends import BACKENDS, DEFAULT_BACKEND, model_name, set_threads
+from transcript_cache import cache, audio_digest
+from storage import SupabaseStorage, SQLiteStorage, QueuedStorage
+from docx_stream import read_docx_text
+from instrument import JobMetrics, log_job
+from jobs import JobQueue, QueueFull, DONE, FAILED, CANCELLED
+from profiles import PROFILES, DEFAULT_PROFILE, get_profile, profile_label, profile_options
+
+PAGE_SIZE = 20
 
 st.set_page_config(page_title="会议纪要助手", page_icon="🎙️", layout="centered")
 
-# ── Supabase 初始化 ──────────────────────────────────────────────
-def get_supabase():
+# ── 历史记录存储 ────────────────────────────────────────────────
+# 配置了 Supabase 就用云端，没有配置才用本地 SQLite。配置了却连不上（密钥错、
+# 网络不通、没装 supabase 包）时报错，不悄悄改存到本地文件——那样纪要显示
+# “已保存”，重新部署后却没了。每个进程只建一次客户端，写操作经后台队列批量
+# 提交，保存和删除不阻塞页面。
+def supabase_config():
     try:
-        from supabase import create_client
-        url = st.secrets["SUPABASE_URL"]
-        key = st.secrets["SUPABASE_KEY"]
-        return create_client(url, key)
-    except Exception:
+        return st.secrets["SUPABASE_URL"], st.secrets["SUPABASE_KEY"]
+    except (KeyError, FileNotFoundError):
         return None
 
-def save_to_db(supabase, topic, attendees, content, source):
-    if not supabase:
-        return False
+@st.cache_resource
+def get_storage():
+    config = supabase_config()
+    if config is None:
+        return QueuedStorage(SQLiteStorage())
+    from supabase import create_client
+    return QueuedStorage(SupabaseStorage(create_client(*config)))
+
+def save_to_db(store, topic, attendees, content, source, audio_key=None):
     try:
-        supabase.table("meeting_minutes").insert({
-            "topic": topic or "（未填写）",
-            "attendees": attendees or "（未填写）",
-            "content": content,
-            "source": source,
-            "created_at": datetime.datetime.now().isoformat()
-        }).execute()
+        store.save(topic, attendees, content, source, audio_key)
         return True
     except Exception as e:
         st.warning(f"保存历史记录失败：{e}")
         return False
 
-def load_history(supabase):
-    if not supabase:
-        return []
+def load_history(store, keyword="", page=0, page_size=PAGE_SIZE):
+    try:
+        return store.search(keyword, page * page_size, page_size)
+    except Exception as e:
+        st.warning(f"读取历史记录失败：{e}")
+        return [], 0
+
+def load_content(store, record_id):
     try:
-        res = supabase.table("meeting_minutes").select("*").order("created_at", desc=True).execute()
-        return res.data
-    except Exception:
-        return []
+        return store.get_content(record_id)
+    except Exception as e:
+        st.warning(f"读取记录内容失败：{e}")
+        return ''
 
-def delete_record(supabase, record_id):
-    if not supabase:
-        return
+def delete_record(store, record_id, audio_key=None):
+    # 每条记录的录音归档单独一份，等记录确实删掉之后再由写队列删归档
+    on_deleted = (lambda: archive.delete(audio_key)) if audio_key else None
     try:
-        supabase.table("meeting_minutes").delete().eq("id", record_id).execute()
+        store.delete(record_id, on_deleted)
     except Exception as e:
         st.warning(f"删除失败：{e}")
 
+def archive_recording():
+    # 只有保存到历史记录时才压缩归档录音。转写稿对应的上传文件要还在本会话里
+    # （从网址恢复的旧任务没有），否则这条记录不带录音。解码和压缩都在后台做。
+    pipeline = st.session_state.get("pipeline", {})
+    transcript, upload = pipeline.get("transcript"), pipeline.get("upload")
+    if transcript is None or upload is None or transcript[0][:2] != ('audio', upload[0]):
+        return None
+    current = transcript[1]
+    if not current.get('digest'):
+        return None
+    audio_key = f"{current['digest'][:32]}-{uuid.uuid4().hex[:8]}"
+    archive.write_async(audio_key, upload[1].getvalue(), current.get('segments'))
+    return audio_key
+
 # ── 语音转文字 ───────────────────────────────────────────────────
-@st.cache_resource(show_spinner="正在加载语音模型...")
-def load_whisper():
-    import whisper
-    return whisper.load_model("small")
-
-def transcribe_audio_bytes(audio_bytes, suffix=".wav"):
-    import soundfile as sf
-    from scipy import signal as scipy_signal
-    model = load_whisper()
-    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-        tmp.write(audio_bytes)
-        tmp_path = tmp.name
+# 转写放进进程级任务队列，在工作线程里执行，不能调用 st.* 接口，
+# 进度通过 job.update() 报告，页面轮询显示。
+@st.cache_resource
+def get_job_queue():
+    # PyTorch 线程数是进程级设置，所有用户的任务共用，只在启动时按环境变量设一次
+    threads = int(os.environ.get("TORCH_THREADS", 0))
+    set_threads(threads or None)
+    return JobQueue(workers=int(os.environ.get("TRANSCRIBE_WORKERS", 1)))
+
+def transcribe_job(job, audio_bytes, model_size="small", profile=DEFAULT_PROFILE):
+    options = profile_options(profile)
+    metrics = JobMetrics('web', model=model_size, profile=profile)
+    job.meta['metrics'] = metrics
+    job.update(0.02, "读取音频")
+    # 同一段音频、同样的模型和参数转写过，就直接用缓存结果
+    with metrics.stage('hash'):
+        digest = audio_digest(audio_bytes)
+        key = cache.key(digest, model_size, 'zh', dict(options, vad=True))
+        entry = cache.get(key)
+    if entry is not None:
+        metrics.audio_sec = entry.get('audio_sec')
+        metrics.meta['cached'] = True
+        return dict(entry, digest=digest)
+    with metrics.stage('decode'):
+        audio = load_audio(audio_bytes)
+    metrics.audio_sec = len(audio) / 16000
+    job.update(0.1, "加载语音模型" if not manager.is_loaded(model_size) else "模型已就绪")
+    with metrics.stage('load_model'):
+        manager.get(model_size)
+
+    def progress(done, total, resumed):
+        note = f"，从第 {resumed + 1} 段继续" if resumed else ""
+        job.update(0.2 + 0.8 * done / total, f"识别语音：已完成 {done}/{total} 段{note}")
+
+    # 分段转写并写断点，任务取消或进程重启后重新提交同一段音频会接着转。
+    # 多个工作线程用同一个模型时 manager.use 让它们轮流解码
+    job.update(message="等待模型空闲")
+    with metrics.stage('transcribe'), manager.use(model_size) as model:
+        result = transcribe_resumable(model, audio, key, language='zh', cancel=job.cancel_event,
+                                      progress=progress, **options)
+    entry = {'text': result['text'], 'skipped_sec': result['skipped_sec'], 'audio_sec': metrics.audio_sec,
+             'segments': compact_segments(result['segments'])}
+    cache.put(key, **entry, model=model_size, language='zh')
+    return dict(entry, digest=digest)
+
+# ── 会话内逐级缓存 ──────────────────────────────────────────────
+# 新建纪要页的每一步（转写稿 → 纪要 → Word）都存在 st.session_state.pipeline
+# 里，连同算它时用到的输入。页面重跑时输入没变就直接取上次的结果，只有某一步
+# 自己的输入变了才重算这一步。读音频、算指纹、解码都在转写任务里做，不占页面
+# 线程；同一个上传文件、同样的模型和档位只提交一次任务，结果记为转写稿。
+def session_stage(name, inputs, compute):
+    state = st.session_state.setdefault("pipeline", {})
+    cached = state.get(name)
+    if cached is not None and cached[0] == inputs:
+        return cached[1]
+    value = compute()
+    state[name] = (inputs, value)
+    return value
+
+def current_transcript():
+    cached = st.session_state.get("pipeline", {}).get("transcript")
+    return cached[1] if cached else None
+
+def set_transcript(inputs, **transcript):
+    st.session_state.setdefault("pipeline", {})["transcript"] = (inputs, transcript)
+
+def request_transcription(uploaded, source):
+    inputs = ('audio', uploaded.file_id, model_size, profile)
+    pipeline = st.session_state.setdefault("pipeline", {})
+    pending = pipeline.get("job")
+    if pending is not None and pending[0] == inputs:
+        # 这个文件用这个模型已经提交过：转写稿还在就直接显示，任务还在就接着等
+        job = jobs.get(pending[1])
+        if "transcript" in pipeline and pipeline["transcript"][0] == inputs:
+            st.session_state.pop("current_job", None)
+            return
+        if job is not None and job.state not in (FAILED, CANCELLED):
+            st.session_state.current_job = job.id
+            return
     try:
-        data, sr = sf.read(tmp_path, dtype='float32')
-        if data.ndim > 1:
-            data = data.mean(axis=1)
-        if sr != 16000:
-            new_len = int(len(data) * 16000 / sr)
-            data = scipy_signal.resample(data, new_len).astype('float32')
-        result = model.transcribe(data, language='zh', task='transcribe',
-                                  temperature=0, best_of=1, beam_size=5)
-        return result['text'].strip()
-    finally:
-        os.unlink(tmp_path)
-
-# ── 生成纪要 ────────────────────────────────────────────────────
-def generate_minutes(content, attendees, topic, source):
-    now = datetime.datetime.now()
-    date_str = now.strftime("%Y年%m月%d日 %H:%M")
-    sentences = [s.strip() for s in
-                 content.replace('。', '。\n').replace('！', '！\n').replace('？', '？\n').split('\n')
-                 if s.strip()]
-    minutes = f"""会议纪要
-{'='*40}
-会议时间：{date_str}
-参会人员：{attendees or '（未填写）'}
-会议主题：{topic or '（未填写）'}
-来　　源：{source}
-
-【原始内容】
-{content}
-
-【要点整理】
-"""
-    for i, s in enumerate(sentences[:15], 1):
-        minutes += f"{i}. {s}\n"
-    minutes += f"\n【待办事项】\n（请手动补充）\n\n{'='*40}\n生成时间：{date_str}\n"
-    return minutes
-
-def minutes_to_docx(text):
-    from docx import Document as DocxDoc
-    doc = DocxDoc()
-    doc.add_heading('会议纪要', 0)
-    for line in text.split('\n'):
-        doc.add_paragraph(line)
-    buf = io.BytesIO()
-    doc.save(buf)
-    buf.seek(0)
-    return buf
+        job = jobs.submit(transcribe_job, uploaded.getvalue(), model_size, profile, label=source)
+    except QueueFull:
+        st.error("当前排队的转写任务太多，请稍后再试")
+        return
+    job.meta.update(source=source, inputs=inputs)
+    pipeline["job"] = (inputs, job.id)
+    # 留着上传文件，保存历史记录时归档录音用
+    pipeline["upload"] = (uploaded.file_id, uploaded)
+    pipeline.pop("transcript", None)
+    st.session_state.setdefault("my_jobs", []).append(job.id)
+    st.session_state.current_job = job.id
+    # 任务 ID 写进网址，刷新页面或稍后打开同一链接都能取回结果
+    st.query_params["job"] = job.id
+    st.rerun()
+
+def read_document(doc_file):
+    if doc_file.name.endswith(".docx"):
+        return read_docx_text(io.BytesIO(doc_file.getvalue()))
+    return doc_file.getvalue().decode('utf-8')
+
+@st.fragment(run_every=1.0)
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if job is None or job.done:
+        # 已完成：整页重跑一次，显示纪要
+        st.rerun()
+    position = jobs.position(job_id)
+    if position:
+        st.info(f"⏳ 排队中，前面还有 {position - 1} 个任务")
+    else:
+        st.progress(job.progress, text=f"🔄 {job.message}（已用时 {time.time() - job.started:.0f} 秒）")
+    if not job.cancel_event.is_set() and st.button("✖ 取消转写", key=f"cancel_{job_id}"):
+        jobs.cancel(job_id)
+        st.rerun()
+
+# ── 录音回放 ────────────────────────────────────────────────────
+# 从纪要的【要点整理】里取出各条要点，按归档里的分段时间戳定位，
+# 只解码那一小段录音来播放。
+def key_point_lines(content):
+    section = content.split("【要点整理】", 1)[-1].split("【", 1)[0] if "【要点整理】" in content else ""
+    return [m.group(1) for m in re.finditer(r'^\s*\d+[.、．]\s*(.+)$', section, re.M)]
+
+def play_key_points(record_id, audio_key, content):
+    points = key_point_lines(content)
+    if not points:
+        return
+    point = st.selectbox("🔊 回放要点", points, index=None, placeholder="选择一条要点试听",
+                         key=f"point_{record_id}")
+    if point:
+        span = archive.find(audio_key, point)
+        if span is None:
+            st.caption("没有找到这条要点对应的录音位置")
+        else:
+            st.audio(archive.read(audio_key, *span), sample_rate=16000)
+            st.caption(f"{span[0]:.1f} – {span[1]:.1f} 秒")
+
+# ── Word 导出 ───────────────────────────────────────────────────
+# 按内容缓存生成好的 docx，同一份纪要反复重跑页面时不再重复生成
+@st.cache_data(max_entries=64, show_spinner=False)
+def docx_bytes(content):
+    return minutes_to_docx(content).getvalue()
 
 # ═══════════════════════════════════════════════════════════════
 # 主界面
 # ═══════════════════════════════════════════════════════════════
-supabase = get_supabase()
+try:
+    store = get_storage()
+except Exception as e:
+    st.error(f"无法连接 Supabase 历史记录库：{e}。请检查 SUPABASE_URL / SUPABASE_KEY 和网络。")
+    st.stop()
+jobs = get_job_queue()
+# 从网址里带回之前提交的任务
+if "current_job" not in st.session_state and st.query_params.get("job"):
+    st.session_state.current_job = st.query_params["job"]
+    st.session_state.setdefault("my_jobs", []).append(st.query_params["job"])
+while store.errors:
+    st.warning(f"历史记录写入失败：{store.errors.popleft()}")
 
 page = st.sidebar.radio("📌 导航", ["✍️ 新建会议纪要", "📚 历史记录"])
 
+profile = st.sidebar.selectbox("🎚️ 解码档位", list(PROFILES), index=list(PROFILES).index(DEFAULT_PROFILE),
+                               format_func=profile_label,
+                               help="原设置：与加档位之前相同；快速：贪心解码、不回退；精确：束搜索加温度回退，最慢")
+# 模型默认跟随档位，换档位时重置，也可以单独改
+size = st.sidebar.selectbox("🧠 识别模型", MODEL_SIZES, index=MODEL_SIZES.index(get_profile(profile)['size']),
+                            key=f"size_{profile}")
+backend = st.sidebar.selectbox("⚙️ 推理后端", list(BACKENDS), index=list(BACKENDS).index(DEFAULT_BACKEND),
+                               help="int8 对线性层做动态量化，CPU 上明显更快，识别准确率略有下降")
+model_size = model_name(size, backend)
+# 页面一打开就在后台加载模型，等用户上传完音频时通常已经就绪
+manager.preload(model_size)
+for m in manager.stats():
+    st.sidebar.caption(f"{m['name']}：常驻 {m['size_mb']:.0f} MB，加载耗时 {m['load_sec']:.1f} 秒")
+cache_stats = cache.stats()
+st.sidebar.caption(f"转写缓存：命中 {cache_stats['hits']} 次，未命中 {cache_stats['misses']} 次")
+queue_stats = jobs.stats()
+st.sidebar.caption(f"转写队列：处理中 {queue_stats['running']} 个，排队 {queue_stats['queued']} 个")
+
+# 本会话提交过的任务，点一下切换到该任务的结果
+STATE_LABELS = {'queued': '排队中', 'running': '处理中', 'done': '已完成', 'failed': '失败', 'cancelled': '已取消'}
+my_jobs = [j for j in (jobs.get(i) for i in st.session_state.get("my_jobs", [])) if j is not None]
+if my_jobs:
+    st.sidebar.markdown("**🗂️ 我的转写任务**")
+    for j in reversed(my_jobs[-5:]):
+        created = datetime.datetime.fromtimestamp(j.created).strftime("%H:%M:%S")
+        if st.sidebar.button(f"{created} {j.label}（{STATE_LABELS[j.state]}）", key=f"job_{j.id}"):
+            st.session_state.current_job = j.id
+            st.query_params["job"] = j.id
+            st.rerun()
+
 # ──────────────────────────────────────────────────────────────
 # 页面一：新建会议纪要
 # ──────────────────────────────────────────────────────────────
@@ -134,43 +293,73 @@ if page == "✍️ 新建会议纪要":
     st.divider()
 
     tab1, tab2, tab3 = st.tabs(["🎙️ 录音", "📂 上传音频", "📄 上传手写记录"])
-    transcript = None
-    source = ""
 
     with tab1:
         st.info("点击麦克风按钮开始录音，录完后点停止")
         audio_value = st.audio_input("录音")
         if audio_value and st.button("🔄 转文字并生成会议纪要", key="btn_record"):
-            with st.spinner("正在识别语音..."):
-                transcript = transcribe_audio_bytes(audio_value.getvalue())
-                source = "语音录音转写"
+            request_transcription(audio_value, "语音录音转写")
 
     with tab2:
         audio_file = st.file_uploader("上传音频", type=["wav", "mp3", "m4a", "ogg", "flac"])
         if audio_file:
             st.audio(audio_file)
             if st.button("🔄 转文字并生成会议纪要", key="btn_audio"):
-                with st.spinner("正在识别语音..."):
-                    ext = "." + audio_file.name.split(".")[-1]
-                    transcript = transcribe_audio_bytes(audio_file.getvalue(), suffix=ext)
-                    source = "音频文件转写"
+                request_transcription(audio_file, "音频文件转写")
 
     with tab3:
         st.info("上传 Word (.docx) 或文本 (.txt) 文件，自动整理为标准会议纪要")
         doc_file = st.file_uploader("上传文件", type=["docx", "txt"])
         if doc_file and st.button("📋 整理为会议纪要", key="btn_doc"):
-            if doc_file.name.endswith(".docx"):
-                from docx import Document
-                doc = Document(io.BytesIO(doc_file.getvalue()))
-                transcript = '\n'.join([p.text for p in doc.paragraphs if p.text.strip()])
-            else:
-                transcript = doc_file.getvalue().decode('utf-8')
-            source = "手写记录整理"
-
-    if transcript:
+            text = session_stage("document", doc_file.file_id, lambda: read_document(doc_file))
+            set_transcript(('document', doc_file.file_id), text=text, source="手写记录整理",
+                           metrics=JobMetrics('web'))
+            st.session_state.pop("current_job", None)
+            st.query_params.pop("job", None)
+
+    # 当前转写任务：还在排队或处理中就显示进度，完成后把结果记为本会话的转写稿
+    busy = False
+    if "current_job" in st.session_state:
+        job = jobs.get(st.session_state.current_job)
+        cached = st.session_state.get("pipeline", {}).get("transcript")
+        if job is None:
+            if cached is None:
+                st.warning("转写任务已过期，请重新提交")
+            st.session_state.pop("current_job")
+        elif not job.done:
+            busy = True
+            job_status(job.id)
+        elif job.state == DONE:
+            inputs = job.meta.get('inputs', ('job', job.id))
+            if cached is None or cached[0] != inputs:
+                set_transcript(inputs, text=job.result['text'], source=job.meta['source'],
+                               digest=job.result.get('digest'), segments=job.result.get('segments'),
+                               skipped_sec=job.result.get('skipped_sec', 0.0),
+                               metrics=job.meta.get('metrics') or JobMetrics('web', model=model_size))
+        else:
+            st.error(f"转写{job.message}")
+            st.caption("已完成的分段已保存，重新提交同一段音频会从断点继续")
+
+    current = current_transcript()
+    if current and not busy:
         st.divider()
         st.subheader("📝 会议纪要")
-        minutes = generate_minutes(transcript, attendees, topic, source)
+        if current.get('skipped_sec'):
+            st.caption(f"已跳过静音 {current['skipped_sec']:.1f} 秒")
+        metrics = current['metrics']
+
+        def make_minutes():
+            with metrics.stage('minutes'):
+                minutes = generate_minutes(current['text'], attendees, topic, current['source'])
+            # 同一份转写稿的任务耗时只记一次日志
+            if not current.get('logged'):
+                log_job(metrics, source=current['source'])
+                current['logged'] = True
+            return minutes
+
+        minutes = session_stage("minutes", (st.session_state.pipeline["transcript"][0], attendees, topic),
+                                make_minutes)
+        st.session_state.last_metrics = metrics
         now_str = datetime.datetime.now().strftime("%Y%m%d_%H%M")
 
         edited = st.text_area("会议纪要（可直接编辑）", value=minutes, height=400)
@@ -180,17 +369,15 @@ if page == "✍️ 新建会议纪要":
             st.download_button("💾 下载 TXT", data=edited.encode('utf-8'),
                                file_name=f"会议纪要_{now_str}.txt", mime="text/plain")
         with col2:
-            st.download_button("📝 下载 Word", data=minutes_to_docx(edited),
+            st.download_button("📝 下载 Word",
+                               data=session_stage("docx", edited, lambda: minutes_to_docx(edited).getvalue()),
                                file_name=f"会议纪要_{now_str}.docx",
                                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
         with col3:
             if st.button("💿 保存到历史记录"):
-                if supabase:
-                    ok = save_to_db(supabase, topic, attendees, edited, source)
-                    if ok:
-                        st.success("✅ 已保存到历史记录！")
-                else:
-                    st.error("未配置数据库，无法保存历史记录")
+                ok = save_to_db(store, topic, attendees, edited, current['source'], archive_recording())
+                if ok:
+                    st.success("✅ 已保存到历史记录！")
 
 # ──────────────────────────────────────────────────────────────
 # 页面二：历史记录
@@ -198,42 +385,71 @@ if page == "✍️ 新建会议纪要":
 elif page == "📚 历史记录":
     st.title("📚 历史会议记录")
 
-    if not supabase:
-        st.error("未配置数据库连接，请先在 Streamlit Secrets 中配置 SUPABASE_URL 和 SUPABASE_KEY")
-        st.stop()
+    # 搜索和分页都交给数据库，列表只取元数据
+    keyword = st.text_input("🔍 搜索（主题 / 参会人 / 内容）", placeholder="输入关键词",
+                            on_change=lambda: st.session_state.update(history_page=0))
+    page_no = st.session_state.get("history_page", 0)
 
-    # 搜索
-    keyword = st.text_input("🔍 搜索（主题 / 参会人 / 内容）", placeholder="输入关键词")
-
-    records = load_history(supabase)
-
-    if keyword:
-        records = [r for r in records if
-                   keyword.lower() in (r.get('topic') or '').lower() or
-                   keyword.lower() in (r.get('attendees') or '').lower() or
-                   keyword.lower() in (r.get('content') or '').lower()]
+    records, total = load_history(store, keyword, page_no)
+    if not records and page_no > 0:
+        # 删掉最后一页的记录后回到第一页
+        st.session_state.history_page = 0
+        st.rerun()
 
     if not records:
         st.info("暂无历史记录" if not keyword else "没有找到相关记录")
     else:
-        st.caption(f"共 {len(records)} 条记录")
+        pages = (total + PAGE_SIZE - 1) // PAGE_SIZE
+        st.caption(f"共 {total} 条记录，第 {page_no + 1} / {pages} 页")
         for r in records:
             created = r.get('created_at', '')[:16].replace('T', ' ')
             with st.expander(f"📄 {r.get('topic', '无主题')}  |  {r.get('attendees', '')}  |  {created}"):
-                st.text_area("内容", value=r.get('content', ''), height=300,
-                             key=f"content_{r['id']}", disabled=False)
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.download_button("💾 下载 TXT",
-                                       data=(r.get('content') or '').encode('utf-8'),
-                                       file_name=f"会议纪要_{created.replace(' ','_')}.txt",
-                                       key=f"dl_txt_{r['id']}")
-                with col2:
-                    st.download_button("📝 下载 Word",
-                                       data=minutes_to_docx(r.get('content') or ''),
-                                       file_name=f"会议纪要_{created.replace(' ','_')}.docx",
-                                       key=f"dl_docx_{r['id']}")
-                with col3:
-                    if st.button("🗑️ 删除", key=f"del_{r['id']}"):
-                        delete_record(supabase, r['id'])
-                        st.rerun()
+                # 正文按需读取，只有打开开关的记录才会查询 content
+                if st.toggle("📖 查看内容", key=f"show_{r['id']}"):
+                    content = load_content(store, r['id'])
+                    st.text_area("内容", value=content, height=300,
+                                 key=f"content_{r['id']}", disabled=False)
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.download_button("💾 下载 TXT",
+                                           data=content.encode('utf-8'),
+                                           file_name=f"会议纪要_{created.replace(' ','_')}.txt",
+                                           key=f"dl_txt_{r['id']}")
+                    with col2:
+                        # 点了才生成，没人下载的记录不花时间排版
+                        docx_key = f"docx_{r['id']}"
+                        if st.session_state.get(docx_key) or st.button("📝 生成 Word", key=f"gen_{docx_key}"):
+                            st.session_state[docx_key] = True
+                            st.download_button("📝 下载 Word",
+                                               data=docx_bytes(content),
+                                               file_name=f"会议纪要_{created.replace(' ','_')}.docx",
+                                               key=f"dl_{docx_key}")
+                    if archive.exists(r.get('audio_key')):
+                        play_key_points(r['id'], r['audio_key'], content)
+                if st.button("🗑️ 删除", key=f"del_{r['id']}"):
+                    delete_record(store, r['id'], r.get('audio_key'))
+                    st.rerun()
+
+        col_prev, col_next = st.columns(2)
+        with col_prev:
+            if page_no > 0 and st.button("⬅️ 上一页"):
+                st.session_state.history_page = page_no - 1
+                st.rerun()
+        with col_next:
+            if page_no + 1 < pages and st.button("下一页 ➡️"):
+                st.session_state.history_page = page_no + 1
+                st.rerun()
+
+# ── 性能面板 ────────────────────────────────────────────────────
+# 放在脚本末尾，本次运行刚完成的任务也能显示出来
+last = st.session_state.get('last_metrics')
+if last is not None:
+    with st.sidebar.expander("⏱️ 最近一次任务耗时", expanded=False):
+        info = last.to_dict()
+        if info['audio_sec']:
+            st.caption(f"音频 {info['audio_sec']:.1f} 秒，总耗时 {info['total_sec']:.1f} 秒，实时率 {info['rtf']:.2f}")
+        st.caption(f"模型 {info['model']}" + ("（命中缓存）" if info.get('cached') else ""))
+        st.dataframe(
+            [{"阶段": s['stage'], "耗时(秒)": s['sec'], "实时率": s['rtf'], "峰值内存(MB)": s['peak_mb']}
+             for s in info['stages']],
+            hide_index=True, use_container_width=True)
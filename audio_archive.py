@@ -0,0 +1,165 @@
+import io
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'audio_archive')
+SAMPLE_RATE = 16000
+
+
+def default_format():
+    import soundfile as sf
+    return 'opus' if 'OPUS' in sf.available_subtypes('OGG') else 'flac'
+
+
+def compact_segments(segments):
+    # Whisper 的分段只留起止时间和文字；已经是 [start, end, text] 的原样保留
+    return [list(s) if isinstance(s, (list, tuple)) else
+            [round(float(s['start']), 2), round(float(s['end']), 2), s['text'].strip()]
+            for s in segments or []]
+
+
+# ── 录音归档 ────────────────────────────────────────────────────
+# 每段录音按 chunk_sec 切块，各块独立压缩成 Opus（libsndfile 不支持时用 FLAC），
+# 依次拼进 <key>.bin；<key>.json 记录每块的字节偏移、长度和 Whisper 分段时间戳。
+# 回放某个要点时只读取、解码覆盖该时间段的几块，与录音总长无关。
+# 16 kHz 单声道 Opus 约 3 KB/s，是 float32 WAV 的二十分之一左右。
+class AudioArchive:
+    def __init__(self, directory=DEFAULT_DIR, fmt=None, chunk_sec=10.0, workers=None):
+        self.directory = directory
+        self.fmt = fmt
+        self.chunk_sec = chunk_sec
+        self.workers = workers or min(os.cpu_count() or 1, 8)
+        self._lock = threading.Lock()
+        self._writing = set()
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + '.bin', base + '.json'
+
+    def exists(self, key):
+        return bool(key) and os.path.exists(self._paths(key)[1])
+
+    def _encode(self, block, fmt):
+        import soundfile as sf
+        buf = io.BytesIO()
+        if fmt == 'opus':
+            sf.write(buf, block, SAMPLE_RATE, format='OGG', subtype='OPUS')
+        else:
+            sf.write(buf, block, SAMPLE_RATE, format='FLAC', subtype='PCM_16')
+        return buf.getvalue()
+
+    def write(self, key, audio, segments=None, workers=None):
+        # audio 为 16 kHz 单声道 float32；各块并行压缩（libsndfile 调用期间释放 GIL）
+        fmt = self.fmt or default_format()
+        chunk = int(self.chunk_sec * SAMPLE_RATE)
+        blocks = [audio[i:i + chunk] for i in range(0, len(audio), chunk)]
+        with ThreadPoolExecutor(max_workers=workers or self.workers) as pool:
+            encoded = list(pool.map(lambda b: self._encode(b, fmt), blocks))
+        data_path, index_path = self._paths(key)
+        chunks, offset = [], 0
+        with open(data_path + '.tmp', 'wb') as f:
+            for blob in encoded:
+                f.write(blob)
+                chunks.append([offset, len(blob)])
+                offset += len(blob)
+        index = {
+            'format': fmt,
+            'sample_rate': SAMPLE_RATE,
+            'duration': len(audio) / SAMPLE_RATE,
+            'chunk_sec': self.chunk_sec,
+            'chunks': chunks,
+            'segments': compact_segments(segments),
+        }
+        with open(index_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        # 先换数据再换索引，索引存在即表示归档完整
+        os.replace(data_path + '.tmp', data_path)
+        os.replace(index_path + '.tmp', index_path)
+        return key
+
+    def write_async(self, key, audio, segments=None):
+        # 保存记录时在后台压缩归档，不耽误页面响应；同一个 key 只写一次。
+        # 后台只用一个线程压缩，不跟转写任务抢 CPU。audio 也可以是原始文件
+        # 内容（bytes），在后台线程里解码
+        with self._lock:
+            if self.exists(key) or key in self._writing:
+                return
+            self._writing.add(key)
+
+        def run():
+            try:
+                data = audio
+                if isinstance(data, (bytes, bytearray)):
+                    from pipeline import load_audio
+                    data = load_audio(data)
+                self.write(key, data, segments, workers=1)
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._writing.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def index(self, key):
+        with open(self._paths(key)[1], encoding='utf-8') as f:
+            return json.load(f)
+
+    def read(self, key, start=0.0, end=None):
+        # 只解码覆盖 [start, end) 秒的块
+        import soundfile as sf
+        index = self.index(key)
+        end = index['duration'] if end is None else min(end, index['duration'])
+        if end <= start:
+            return np.zeros(0, dtype='float32')
+        first = int(start // index['chunk_sec'])
+        last = min(int(np.ceil(end / index['chunk_sec'])), len(index['chunks']))
+        parts = []
+        with open(self._paths(key)[0], 'rb') as f:
+            for offset, length in index['chunks'][first:last]:
+                f.seek(offset)
+                data, _ = sf.read(io.BytesIO(f.read(length)), dtype='float32')
+                parts.append(data)
+        audio = np.concatenate(parts) if parts else np.zeros(0, dtype='float32')
+        base = first * index['chunk_sec']
+        lo = int((start - base) * SAMPLE_RATE)
+        hi = int((end - base) * SAMPLE_RATE)
+        return audio[max(lo, 0):hi]
+
+    def find(self, key, sentence, pad=0.5):
+        # 找说出这句话的时间段：先找包含它的分段，否则取字重合最多的分段
+        segments = self.index(key)['segments']
+        if not segments:
+            return None
+        target = ''.join(sentence.split())
+        best, best_score = None, 0.0
+        for i, (start, end, text) in enumerate(segments):
+            text = ''.join(text.split())
+            if target and (target in text or text in target and len(text) >= len(target) / 2):
+                best = i
+                break
+            score = len(set(target) & set(text)) / (len(set(target)) or 1)
+            if score > best_score:
+                best, best_score = i, score
+        if best is None:
+            return None
+        start, end, _ = segments[best]
+        return max(start - pad, 0.0), end + pad
+
+    def size(self, key):
+        return os.path.getsize(self._paths(key)[0])
+
+    def delete(self, key):
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+archive = AudioArchive()
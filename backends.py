@@ -0,0 +1,122 @@
+import sys
+
+# ── 推理后端 ────────────────────────────────────────────────────
+# 模型名写作“尺寸”或“尺寸-后端”，例如 small、small-int8。后端负责把模型
+# 加载成带 transcribe() 方法的对象，pipeline.transcribe 不关心具体实现；
+# 新后端实现 load()/estimate_mb() 后调用 register_backend() 即可在两个前端里选用。
+DEFAULT_BACKEND = 'float32'
+
+# PyTorch 线程设置：intra 是单个算子内部的并行线程数，inter 是算子之间的并行数。
+# None 表示沿用 torch 默认值（intra 等于物理核数）。
+_threads = {'intra': None, 'inter': None}
+
+
+def set_threads(intra=None, inter=None):
+    _threads['intra'] = intra
+    _threads['inter'] = inter
+    _apply_threads()
+
+
+def _apply_threads():
+    if 'torch' not in sys.modules:
+        # torch 还没导入时只记下来，等加载模型时再设置
+        return
+    import torch
+    if _threads['intra']:
+        torch.set_num_threads(_threads['intra'])
+    if _threads['inter']:
+        try:
+            torch.set_num_interop_threads(_threads['inter'])
+        except RuntimeError:
+            # 算子间线程池一旦启动就不能再改，只能在第一次推理前设置
+            pass
+
+
+class Backend:
+    name = ''
+
+    def load(self, size):
+        raise NotImplementedError
+
+    def estimate_mb(self, size):
+        raise NotImplementedError
+
+
+class TorchBackend(Backend):
+    name = 'float32'
+    # None 交给 Whisper 自己选：有 CUDA 用 GPU，否则用 CPU
+    device = None
+    # 各尺寸 float32 权重的大致内存占用（MB）
+    ESTIMATED_MB = {'tiny': 150, 'base': 290, 'small': 970}
+
+    def load(self, size):
+        import torch  # noqa: F401  先导入，线程设置才能生效
+        import whisper
+        _apply_threads()
+        return whisper.load_model(size, device=self.device)
+
+    def estimate_mb(self, size):
+        return self.ESTIMATED_MB.get(size, 0)
+
+
+class Int8Backend(TorchBackend):
+    # 对 Linear 层做动态 int8 量化：权重离线量化成 int8，激活在运行时按批量化。
+    # Whisper 的计算量大部分在注意力和 MLP 的 Linear 里，卷积和词嵌入保持 float32。
+    name = 'int8'
+    # 动态量化只有 CPU 实现
+    device = 'cpu'
+
+    def load(self, size):
+        return quantize_linear(super().load(size))
+
+    def estimate_mb(self, size):
+        return self.ESTIMATED_MB.get(size, 0) * 2 // 5
+
+
+def quantize_linear(model):
+    import torch
+    from torch import nn
+    engines = torch.backends.quantized.supported_engines
+    if 'fbgemm' not in engines and 'qnnpack' in engines:
+        # ARM 机器上只有 qnnpack
+        torch.backends.quantized.engine = 'qnnpack'
+    # Whisper 自己的 Linear 是 nn.Linear 的子类（只改了前向时的 dtype 转换），
+    # quantize_dynamic 按精确类型匹配，先还原成 nn.Linear 才会被替换
+    for module in model.modules():
+        if isinstance(module, nn.Linear) and type(module) is not nn.Linear:
+            module.__class__ = nn.Linear
+    return torch.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+BACKENDS = {}
+
+
+def register_backend(backend):
+    BACKENDS[backend.name] = backend
+
+
+register_backend(TorchBackend())
+register_backend(Int8Backend())
+
+
+def model_name(size, backend=DEFAULT_BACKEND):
+    return size if backend == DEFAULT_BACKEND else f"{size}-{backend}"
+
+
+def parse_model_name(name):
+    size, _, backend = name.partition('-')
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"不支持的推理后端：{backend}")
+    return size, backend
+
+
+def load_model(name):
+    size, backend = parse_model_name(name)
+    return BACKENDS[backend].load(size)
+
+
+def estimate_mb(name):
+    size, backend = parse_model_name(name)
+    return BACKENDS[backend].estimate_mb(size)
+
@@ -0,0 +1,119 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from pipeline import load_audio, transcribe, generate_minutes, minutes_to_docx
+from transcript_cache import cache, audio_digest
+
+AUDIO_EXTS = ('.wav', '.mp3', '.m4a', '.ogg', '.flac')
+
+# 每个工作进程只加载一次模型
+_model = None
+_model_name = None
+
+
+def _init_worker(model_name, threads):
+    global _model, _model_name
+    from backends import load_model, set_threads
+    set_threads(threads, 1)
+    _model = load_model(model_name)
+    _model_name = model_name
+
+
+def _process_file(path, language, formats, attendees, topic):
+    started = time.perf_counter()
+    key = cache.key(audio_digest(path), _model_name, language, {'vad': True})
+    entry = cache.get(key)
+    if entry is None:
+        audio = load_audio(path)
+        result = transcribe(_model, audio, language=language)
+        text, skipped = result['text'], result['skipped_sec']
+        duration = len(audio) / 16000
+        cache.put(key, text, model=_model_name, language=language,
+                  duration=duration, skipped_sec=skipped)
+    else:
+        text = entry['text']
+        duration = entry.get('duration', 0.0)
+        skipped = entry.get('skipped_sec', 0.0)
+    minutes = generate_minutes(text, attendees, topic, f"音频文件转写：{os.path.basename(path)}")
+
+    stem = os.path.splitext(path)[0]
+    outputs = []
+    if 'txt' in formats:
+        out = f"{stem}_会议纪要.txt"
+        with open(out, 'w', encoding='utf-8') as f:
+            f.write(minutes)
+        outputs.append(out)
+    if 'docx' in formats:
+        out = f"{stem}_会议纪要.docx"
+        with open(out, 'wb') as f:
+            f.write(minutes_to_docx(minutes).getvalue())
+        outputs.append(out)
+    return duration, skipped, time.perf_counter() - started, outputs
+
+
+def find_audio_files(directory, recursive=False):
+    files = []
+    for root, dirs, names in os.walk(directory):
+        files.extend(os.path.join(root, n) for n in names if n.lower().endswith(AUDIO_EXTS))
+        if not recursive:
+            break
+    return sorted(files)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="批量把目录下的会议录音转写为会议纪要")
+    parser.add_argument('directory', help="录音所在目录")
+    parser.add_argument('-j', '--workers', type=int, default=max((os.cpu_count() or 2) // 2, 1),
+                        help="并行工作进程数（每个进程各加载一份模型）")
+    parser.add_argument('-m', '--model', default='base', help="Whisper 模型，如 base、small-int8（int8 量化）")
+    parser.add_argument('-l', '--language', default='zh', help="识别语言")
+    parser.add_argument('-f', '--formats', default='txt,docx', help="输出格式，逗号分隔：txt,docx")
+    parser.add_argument('-r', '--recursive', action='store_true', help="递归处理子目录")
+    parser.add_argument('--attendees', default='', help="参会人员")
+    parser.add_argument('--topic', default='', help="会议主题")
+    args = parser.parse_args(argv)
+
+    files = find_audio_files(args.directory, args.recursive)
+    if not files:
+        print("没有找到音频文件")
+        return 1
+    formats = {f.strip() for f in args.formats.split(',') if f.strip()}
+    workers = min(args.workers, len(files))
+    threads = max((os.cpu_count() or 1) // workers, 1)
+    print(f"共 {len(files)} 个文件，{workers} 个进程，每进程 {threads} 线程，模型 {args.model}")
+
+    started = time.perf_counter()
+    audio_sec = 0.0
+    skipped_sec = 0.0
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(args.model, threads)) as pool:
+        futures = {pool.submit(_process_file, path, args.language, formats,
+                               args.attendees, args.topic): path for path in files}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                duration, skipped, elapsed, outputs = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"❌ {path}：{e}", file=sys.stderr)
+                continue
+            audio_sec += duration
+            skipped_sec += skipped
+            print(f"✅ {path}（音频 {duration:.1f} 秒，跳过静音 {skipped:.1f} 秒，"
+                  f"耗时 {elapsed:.1f} 秒）→ {', '.join(outputs)}")
+    wall = time.perf_counter() - started
+
+    done = len(files) - failed
+    print(f"\n完成 {done} 个，失败 {failed} 个，总耗时 {wall:.1f} 秒，共跳过静音 {skipped_sec:.1f} 秒")
+    if wall > 0:
+        print(f"吞吐：{done / wall * 3600:.1f} 文件/小时，"
+              f"{audio_sec / wall:.2f} 音频小时/墙钟小时")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,50 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from audio_archive import AudioArchive
+from pipeline import load_audio
+
+FIXTURE = os.path.join(ROOT, 'test_meeting.wav')
+
+
+# 录音归档：压缩比、归档耗时，以及回放一个 5 秒片段与解码整个文件的耗时对比
+def main():
+    import numpy as np
+    import soundfile as sf
+    parser = argparse.ArgumentParser(description="录音归档的压缩比和随机读取耗时")
+    parser.add_argument('--minutes', type=float, nargs='+', default=[1, 10, 60])
+    parser.add_argument('--format', choices=['opus', 'flac'], default=None)
+    args = parser.parse_args()
+
+    base = load_audio(FIXTURE)
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = AudioArchive(tmp, fmt=args.format)
+        for minutes in args.minutes:
+            audio = np.resize(base, int(minutes * 60 * 16000))
+            wav = os.path.join(tmp, 'full.wav')
+            sf.write(wav, audio, 16000, subtype='FLOAT')
+            started = time.perf_counter()
+            archive.write('bench', audio)
+            write_sec = time.perf_counter() - started
+
+            started = time.perf_counter()
+            load_audio(wav)
+            full_sec = time.perf_counter() - started
+            middle = minutes * 30
+            started = time.perf_counter()
+            archive.read('bench', middle, middle + 5)
+            seek_ms = (time.perf_counter() - started) * 1000
+            print(f"{minutes:>5g} 分钟：WAV {os.path.getsize(wav) / 1e6:.1f} MB → "
+                  f"{archive.index('bench')['format']} {archive.size('bench') / 1e6:.2f} MB"
+                  f"（{os.path.getsize(wav) / archive.size('bench'):.1f}x），归档 {write_sec:.1f}s，"
+                  f"取 5 秒片段 {seek_ms:.1f} ms，整段解码 {full_sec * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
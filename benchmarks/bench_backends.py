@@ -0,0 +1,80 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIXTURE = os.path.join(ROOT, 'test_meeting.wav')
+
+
+# 比较不同推理后端的速度和识别结果：每个模型在独立子进程里加载和转写，
+# 线程设置互不影响。没有人工标注时，以同尺寸 float32 的结果为参照计算字错率
+# （中文没有空格分词，用字错率代替词错率）。
+def _run(name, path, threads, interop):
+    from backends import load_model, set_threads
+    from model_manager import model_size_mb
+    from pipeline import load_audio, transcribe
+    set_threads(threads, interop)
+    audio = load_audio(path)
+    started = time.perf_counter()
+    model = load_model(name)
+    load_sec = time.perf_counter() - started
+    started = time.perf_counter()
+    result = transcribe(model, audio, language='zh', fp16=False)
+    return {
+        'name': name,
+        'load_sec': load_sec,
+        'sec': time.perf_counter() - started,
+        'audio_sec': len(audio) / 16000,
+        'size_mb': model_size_mb(model),
+        'text': result['text'],
+    }
+
+
+def main():
+    from backends import parse_model_name
+    from metrics import char_error_rate
+
+    parser = argparse.ArgumentParser(description="比较 float32 与 int8 推理后端的速度和字错率")
+    parser.add_argument('--models', nargs='+', default=['base', 'small', 'small-int8'])
+    parser.add_argument('--audio', default=FIXTURE, help="测试音频")
+    parser.add_argument('--reference', help="人工校对的文本文件，给出时以它为参照计算字错率")
+    parser.add_argument('--threads', type=int, default=None, help="算子内线程数")
+    parser.add_argument('--interop', type=int, default=None, help="算子间线程数")
+    args = parser.parse_args()
+
+    names = list(args.models)
+    # 量化模型需要同尺寸的 float32 结果作参照
+    for name in args.models:
+        size, _ = parse_model_name(name)
+        if not args.reference and size not in names:
+            names.append(size)
+
+    results = {}
+    for name in names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            results[name] = pool.submit(_run, name, args.audio, args.threads, args.interop).result()
+
+    reference = None
+    if args.reference:
+        with open(args.reference, encoding='utf-8') as f:
+            reference = f.read()
+    fastest_float = min((r['sec'] for n, r in results.items() if parse_model_name(n)[1] == 'float32'),
+                        default=None)
+
+    print(f"{'模型':<12}{'加载(s)':>9}{'转写(s)':>9}{'实时率':>9}{'内存(MB)':>10}{'字错率':>9}{'相对最快float32':>17}")
+    for name in names:
+        r = results[name]
+        ref = reference if reference is not None else results[parse_model_name(name)[0]]['text']
+        cer = char_error_rate(ref, r['text'])
+        relative = f"{r['sec'] / fastest_float:.2f}x" if fastest_float else '-'
+        print(f"{name:<12}{r['load_sec']:>9.1f}{r['sec']:>9.1f}{r['sec'] / r['audio_sec']:>9.3f}"
+              f"{r['size_mb']:>10.0f}{cer:>9.2%}{relative:>17}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx_stream import write_docx, read_docx_text
+from pipeline import generate_minutes
+
+
+# 对比 python-docx 与流式读写 Word 的耗时
+def python_docx_export(text):
+    from docx import Document
+    doc = Document()
+    doc.add_heading('会议纪要', 0)
+    for line in text.split('\n'):
+        doc.add_paragraph(line)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def python_docx_import(data):
+    from docx import Document
+    doc = Document(io.BytesIO(data))
+    return '\n'.join([p.text for p in doc.paragraphs if p.text.strip()])
+
+
+def stream_export(text):
+    buf = io.BytesIO()
+    write_docx(text, buf)
+    return buf.getvalue()
+
+
+def stream_import(data):
+    return read_docx_text(io.BytesIO(data))
+
+
+def check_round_trip():
+    # 原始内容里以数字开头的句子不能被当成列表项去掉编号，要点里的编号照常转成列表
+    content = "3.5亿元的预算已经批准。\n2024.10.18 开会\n1、先看市场部的方案"
+    text = generate_minutes(content, "张三", "预算", "回归检查")
+    paragraphs = read_docx_text(io.BytesIO(stream_export(text))).split('\n')
+    missing = [line for line in content.split('\n') if line not in paragraphs]
+    if missing:
+        raise SystemExit(f"Word 导出改动了正文：{missing}")
+    if any(p.startswith(('1. ', '2. ')) for p in paragraphs):
+        raise SystemExit("要点整理里的编号没有转成自动编号列表")
+
+
+def timed(fn, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    check_round_trip()
+    sentence = "今天我们讨论了产品上线的时间安排，张三负责下周完成回归测试。"
+    for n in (1000, 10000, 30000):
+        content = '\n'.join(f"{sentence}（第 {i} 句）" for i in range(n))
+        text = generate_minutes(content, "张三、李四", "产品上线讨论", "基准测试")
+        old_export, old_bytes = timed(python_docx_export, text)
+        new_export, new_bytes = timed(stream_export, text)
+        old_import, _ = timed(python_docx_import, old_bytes)
+        new_import, _ = timed(stream_import, old_bytes)
+        print(f"{n:>6} 行  导出 python-docx {old_export:.3f}s / 流式 {new_export:.3f}s "
+              f"（{old_export / new_export:.1f}x）  "
+              f"导入 python-docx {old_import:.3f}s / 流式 {new_import:.3f}s "
+              f"（{old_import / new_import:.1f}x）  "
+              f"文件 {len(old_bytes) // 1024} KB / {len(new_bytes) // 1024} KB")
+
+
+if __name__ == '__main__':
+    main()
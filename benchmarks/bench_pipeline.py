@@ -0,0 +1,328 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIXTURE = os.path.join(ROOT, 'test_meeting.wav')
+FIXTURE_DIR = os.path.join(tempfile.gettempdir(), 'meeting-minutes-bench')
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+SENTENCES = [
+    "今天我们主要讨论产品上线的时间安排。",
+    "张三负责下周完成回归测试，李四跟进市场推广方案。",
+    "预算方面需要在月底之前提交财务确认。",
+    "用户反馈的几个问题已经修复，新版本会在周五发布。",
+    "大家对这个方案还有什么意见吗？",
+    "好的，那我们就按这个计划推进！",
+]
+
+
+# ── 测试素材 ────────────────────────────────────────────────────
+# 把 test_meeting.wav 重采样成 48 kHz 立体声后循环拼接，生成指定时长的长录音，
+# 模拟用户上传的典型文件；生成一次后留在临时目录里复用。
+def make_fixture(minutes):
+    import numpy as np
+    import soundfile as sf
+    from scipy.signal import resample_poly
+    path = os.path.join(FIXTURE_DIR, f'meeting_{minutes}min_48k_stereo.wav')
+    if os.path.exists(path):
+        return path
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    data, sr = sf.read(FIXTURE, dtype='float32')
+    if data.ndim > 1:
+        data = data.mean(axis=1)
+    if sr != 48000:
+        from pipeline import _resample_ratio
+        up, down = _resample_ratio(sr, 48000)
+        data = resample_poly(data, up, down).astype('float32')
+    base = data
+    rng = np.random.default_rng(minutes)
+    total = minutes * 60 * 48000
+    tmp = path + '.tmp'
+    with sf.SoundFile(tmp, 'w', 48000, 2, 'PCM_16', format='WAV') as f:
+        written = 0
+        while written < total:
+            block = base[:total - written]
+            noise = rng.normal(0, 0.002, (len(block), 2)).astype('float32')
+            f.write(block[:, None] + noise)
+            written += len(block)
+    os.replace(tmp, path)
+    return path
+
+
+def synthetic_transcript(audio_sec):
+    # 中文口语大约每秒 4 个字
+    text, n = [], 0
+    while n < audio_sec * 4:
+        s = SENTENCES[len(text) % len(SENTENCES)]
+        text.append(s)
+        n += len(s)
+    return ''.join(text)
+
+
+def _peak_rss_mb():
+    # Linux 上 ru_maxrss 会跨 exec 继承父进程的峰值，优先读本进程的 VmHWM
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / 1024 / 1024
+        except Exception:
+            return None
+
+
+# ── 各阶段 ──────────────────────────────────────────────────────
+# 每个阶段在全新的子进程里跑，准备输入和导入模块都不计时，峰值内存互不干扰。
+def _decoded(path):
+    import soundfile as sf
+    data, sr = sf.read(path, dtype='float32')
+    if data.ndim > 1:
+        data = data.mean(axis=1)
+    return data, sr
+
+
+def _stage_decode(path):
+    import soundfile as sf
+    started = time.perf_counter()
+    data, sr = sf.read(path, dtype='float32')
+    return time.perf_counter() - started, len(data) / sr
+
+
+def _stage_resample_interp(path):
+    import numpy as np
+    data, sr = _decoded(path)
+    started = time.perf_counter()
+    new_len = int(len(data) / sr * 16000)
+    np.interp(np.linspace(0, len(data), new_len), np.arange(len(data)), data).astype('float32')
+    return time.perf_counter() - started, len(data) / sr
+
+
+def _stage_resample_fft(path):
+    from scipy import signal as scipy_signal
+    data, sr = _decoded(path)
+    started = time.perf_counter()
+    scipy_signal.resample(data, int(len(data) * 16000 / sr)).astype('float32')
+    return time.perf_counter() - started, len(data) / sr
+
+
+def _stage_stream_load(path):
+    # 流式解码 + 混音 + 多相重采样，包含解码时间
+    import scipy.signal  # noqa: F401
+    from pipeline import load_audio
+    started = time.perf_counter()
+    audio = load_audio(path)
+    return time.perf_counter() - started, len(audio) / 16000
+
+
+def _stage_vad(path):
+    from pipeline import load_audio
+    from vad import detect_speech
+    audio = load_audio(path)
+    started = time.perf_counter()
+    detect_speech(audio)
+    return time.perf_counter() - started, len(audio) / 16000
+
+
+def _stage_transcribe_tiny(path):
+    import whisper
+    from pipeline import load_audio
+    audio = load_audio(path)
+    model = whisper.load_model('tiny')
+    started = time.perf_counter()
+    model.transcribe(audio, language='zh')
+    return time.perf_counter() - started, len(audio) / 16000
+
+
+def _stage_generate_minutes(path):
+    import soundfile as sf
+    import scipy.sparse  # noqa: F401
+    import summarizer  # noqa: F401
+    from pipeline import generate_minutes
+    audio_sec = sf.info(path).duration
+    text = synthetic_transcript(audio_sec)
+    started = time.perf_counter()
+    generate_minutes(text, "张三、李四", "基准测试", "语音转写")
+    return time.perf_counter() - started, audio_sec
+
+
+def _stage_minutes_to_docx(path):
+    import soundfile as sf
+    import docx_stream  # noqa: F401
+    from pipeline import generate_minutes, minutes_to_docx
+    audio_sec = sf.info(path).duration
+    minutes = generate_minutes(synthetic_transcript(audio_sec), "张三、李四", "基准测试", "语音转写")
+    started = time.perf_counter()
+    minutes_to_docx(minutes)
+    return time.perf_counter() - started, audio_sec
+
+
+def _history_records(n=1000):
+    return [{'id': i, 'topic': f"第 {i} 次产品例会", 'attendees': "张三、李四、王五",
+             'content': synthetic_transcript(600) + f"编号{i}"} for i in range(n)]
+
+
+def _stage_history_scan(_):
+    # 原来的做法：取回全部记录后在 Python 里做三次 lower() 子串匹配
+    records = _history_records()
+    keyword = "编号999"
+    started = time.perf_counter()
+    [r for r in records if
+     keyword.lower() in (r.get('topic') or '').lower() or
+     keyword.lower() in (r.get('attendees') or '').lower() or
+     keyword.lower() in (r.get('content') or '').lower()]
+    return time.perf_counter() - started, 0.0
+
+
+def _stage_history_fts(_):
+    from storage import SQLiteStorage
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteStorage(os.path.join(tmp, 'bench.db'))
+        for r in _history_records():
+            store.save(r['topic'], r['attendees'], r['content'], "基准测试")
+        started = time.perf_counter()
+        store.search("编号999", 0, 20)
+        elapsed = time.perf_counter() - started
+        store._conn().close()
+    return elapsed, 0.0
+
+
+AUDIO_STAGES = {
+    'decode': _stage_decode,
+    'resample_interp': _stage_resample_interp,
+    'resample_fft': _stage_resample_fft,
+    'stream_load': _stage_stream_load,
+    'vad': _stage_vad,
+    'transcribe_tiny': _stage_transcribe_tiny,
+    'generate_minutes': _stage_generate_minutes,
+    'minutes_to_docx': _stage_minutes_to_docx,
+}
+HISTORY_STAGES = {
+    'history_scan': _stage_history_scan,
+    'history_fts': _stage_history_fts,
+}
+
+
+def _run_in_child(stage, path):
+    fn = AUDIO_STAGES.get(stage) or HISTORY_STAGES[stage]
+    elapsed, audio_sec = fn(path)
+    return elapsed, audio_sec, _peak_rss_mb()
+
+
+def run_stage(stage, path, label):
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+        elapsed, audio_sec, peak = pool.submit(_run_in_child, stage, path).result()
+    return {
+        'stage': stage,
+        'input': label,
+        'audio_sec': round(audio_sec, 2),
+        'wall_sec': round(elapsed, 4),
+        'rtf': round(elapsed / audio_sec, 5) if audio_sec else None,
+        'peak_rss_mb': round(peak, 1) if peak is not None else None,
+    }
+
+
+# ── 基线对比 ────────────────────────────────────────────────────
+def compare(results, baseline, tolerance):
+    old = {(r['stage'], r['input']): r for r in baseline['results']}
+    regressions = []
+    for r in results:
+        base = old.get((r['stage'], r['input']))
+        if not base:
+            continue
+        if r['wall_sec'] > base['wall_sec'] * (1 + tolerance) and r['wall_sec'] - base['wall_sec'] > 0.01:
+            regressions.append(f"{r['stage']} @ {r['input']}：耗时 {base['wall_sec']}s → {r['wall_sec']}s")
+        if (r['peak_rss_mb'] and base.get('peak_rss_mb')
+                and r['peak_rss_mb'] > base['peak_rss_mb'] * (1 + tolerance)):
+            regressions.append(f"{r['stage']} @ {r['input']}：峰值内存 "
+                               f"{base['peak_rss_mb']}MB → {r['peak_rss_mb']}MB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="音频 → 会议纪要 全流程分阶段基准测试")
+    parser.add_argument('--durations', type=int, nargs='*', default=[1, 10, 60],
+                        help="合成长录音的时长（分钟）")
+    parser.add_argument('--stages', nargs='*', default=None, help="只跑指定阶段")
+    parser.add_argument('--transcribe-max-min', type=int, default=10,
+                        help="超过这个时长的录音不跑 tiny 模型转写")
+    parser.add_argument('--name', default=platform.node() or 'default', help="基线名称（通常用机器名）")
+    parser.add_argument('--save-baseline', action='store_true', help="把本次结果保存为基线")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="相对基线允许变慢/变大的比例")
+    args = parser.parse_args(argv)
+
+    inputs = [('test_meeting.wav', FIXTURE, 0)]
+    for minutes in args.durations:
+        print(f"准备 {minutes} 分钟合成录音...")
+        inputs.append((f'{minutes}min', make_fixture(minutes), minutes))
+
+    try:
+        import whisper  # noqa: F401
+        has_whisper = True
+    except ImportError:
+        has_whisper = False
+        print("未安装 openai-whisper，跳过 transcribe_tiny")
+
+    results = []
+    for stage in AUDIO_STAGES:
+        if args.stages and stage not in args.stages:
+            continue
+        for label, path, minutes in inputs:
+            if stage == 'transcribe_tiny' and (not has_whisper or minutes > args.transcribe_max_min):
+                continue
+            results.append(run_stage(stage, path, label))
+            _print(results[-1])
+    for stage in HISTORY_STAGES:
+        if args.stages and stage not in args.stages:
+            continue
+        results.append(run_stage(stage, None, '1000 条记录'))
+        _print(results[-1])
+
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    baseline_path = os.path.join(BASELINE_DIR, f'{args.name}.json')
+    report = {'name': args.name, 'python': platform.python_version(),
+              'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}
+
+    status = 0
+    if os.path.exists(baseline_path) and not args.save_baseline:
+        with open(baseline_path, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\n⚠️ 相对基线出现退化：")
+            for line in regressions:
+                print("  " + line)
+            status = 1
+        else:
+            print(f"\n✅ 与基线 {baseline_path} 相比没有退化")
+    if args.save_baseline or not os.path.exists(baseline_path):
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n基线已保存到 {baseline_path}")
+    return status
+
+
+def _print(r):
+    rtf = f"{r['rtf']:.4f}" if r['rtf'] is not None else '-'
+    peak = f"{r['peak_rss_mb']:.0f}MB" if r['peak_rss_mb'] is not None else '-'
+    print(f"{r['stage']:<18} {r['input']:<18} 耗时 {r['wall_sec']:>9.4f}s  实时率 {rtf:>8}  峰值内存 {peak}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIXTURE = os.path.join(ROOT, 'test_meeting.wav')
+REFERENCE = os.path.join(ROOT, 'benchmarks', 'test_meeting.reference.txt')
+
+
+# 逐个解码档位测实时率和字错率，给两个前端选默认档位提供依据。
+# 每档在独立子进程里加载模型并先用前 10 秒预热一次，计时只含正式转写。
+# 字错率以人工校对的文本为参照（默认 benchmarks/test_meeting.reference.txt）。
+# 参照文本不存在时只报实时率；加 --draft-reference 把精确档的结果写成草稿，
+# 对照录音逐句改正后保存为参照文本。
+def _run(profile, path, backend, threads):
+    from backends import load_model, model_name, set_threads
+    from model_manager import model_size_mb
+    from pipeline import load_audio, transcribe
+    from profiles import get_profile, profile_options
+    set_threads(threads)
+    audio = load_audio(path)
+    name = model_name(get_profile(profile)['size'], backend)
+    model = load_model(name)
+    options = profile_options(profile)
+    transcribe(model, audio[:10 * 16000], language='zh', **options)
+    started = time.perf_counter()
+    result = transcribe(model, audio, language='zh', **options)
+    sec = time.perf_counter() - started
+    return {
+        'profile': profile,
+        'model': name,
+        'sec': sec,
+        'audio_sec': len(audio) / 16000,
+        'size_mb': model_size_mb(model),
+        'text': result['text'],
+    }
+
+
+def main():
+    from backends import BACKENDS, DEFAULT_BACKEND
+    from metrics import char_error_rate
+    from profiles import PROFILES
+
+    parser = argparse.ArgumentParser(description="比较各解码档位的实时率和字错率")
+    parser.add_argument('--profiles', nargs='+', default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument('--audio', default=FIXTURE, help="测试音频")
+    parser.add_argument('--reference', default=REFERENCE, help="人工校对的参照文本")
+    parser.add_argument('--draft-reference', action='store_true',
+                        help="参照文本不存在时，把精确档的结果写到该路径作为待校对的草稿")
+    parser.add_argument('--backend', default=DEFAULT_BACKEND, choices=list(BACKENDS))
+    parser.add_argument('--threads', type=int, default=None, help="推理线程数")
+    parser.add_argument('--json', help="把结果另存为 JSON 文件")
+    args = parser.parse_args()
+
+    names = list(args.profiles)
+    has_reference = os.path.exists(args.reference)
+    if args.draft_reference and not has_reference and 'accurate' not in names:
+        names.append('accurate')
+
+    results = {}
+    for profile in names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            results[profile] = pool.submit(_run, profile, args.audio, args.backend, args.threads).result()
+
+    reference = None
+    if has_reference:
+        with open(args.reference, encoding='utf-8') as f:
+            reference = f.read()
+    elif args.draft_reference:
+        with open(args.reference, 'w', encoding='utf-8') as f:
+            f.write(results['accurate']['text'] + '\n')
+
+    print(f"{'档位':<16}{'模型':<12}{'转写(s)':>9}{'实时率':>9}{'内存(MB)':>10}{'字错率':>9}")
+    for profile in names:
+        r = results[profile]
+        r['rtf'] = r['sec'] / r['audio_sec']
+        r['cer'] = char_error_rate(reference, r['text']) if reference is not None else None
+        cer = f"{r['cer']:.2%}" if r['cer'] is not None else '-'
+        print(f"{profile:<16}{r['model']:<12}{r['sec']:>9.1f}{r['rtf']:>9.3f}"
+              f"{r['size_mb']:>10.0f}{cer:>9}")
+    if reference is None and args.draft_reference:
+        print(f"已把精确档的结果写到 {args.reference}，请对照录音人工校对后再运行一次")
+    elif reference is None:
+        print(f"没有参照文本 {args.reference}，只报实时率；加 --draft-reference 生成待校对的草稿")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([results[p] for p in names], f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
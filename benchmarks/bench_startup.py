@@ -0,0 +1,68 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# 桌面版冷启动耗时：窗口出现用了多久、后台预热完又用了多久。
+# 对照组在子进程里按旧版 main.py 的顺序先把重模块全部导入，相当于改动前
+# 窗口出现之前必须等待的时间。
+# 本机没装的模块跳过，并在结果里列出来。
+EAGER_MODULES = ('whisper', 'numpy', 'soundfile', 'sounddevice', 'scipy.signal', 'pipeline', 'summarizer',
+                 'recorder', 'live_transcriber', 'parallel_transcribe', 'docx_stream')
+EAGER = ("import importlib, json\n"
+         "missing = []\n"
+         f"for name in {EAGER_MODULES!r}:\n"
+         "    try:\n"
+         "        importlib.import_module(name)\n"
+         "    except ImportError:\n"
+         "        missing.append(name)\n"
+         "print(json.dumps(missing))\n")
+
+
+def run_probe():
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, os.path.join(ROOT, 'main.py'), '--startup-probe'],
+                         cwd=ROOT, capture_output=True, text=True, timeout=300)
+    wall = time.perf_counter() - started
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1] if out.stderr.strip() else 'main.py 退出异常')
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result['process_sec'] = round(wall, 3)
+    return result
+
+
+def run_eager():
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, '-c', EAGER], cwd=ROOT, check=True, capture_output=True, text=True)
+    return time.perf_counter() - started, json.loads(out.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量桌面版冷启动耗时")
+    parser.add_argument('-n', '--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [run_eager() for _ in range(args.repeat)]
+    eager = [sec for sec, _ in runs]
+    print(f"旧版：窗口出现前需导入重模块 {statistics.median(eager):.2f}s（中位数，{args.repeat} 次）")
+    if runs[0][1]:
+        print(f"  未安装、未计入：{', '.join(runs[0][1])}")
+
+    if sys.platform.startswith('linux') and not os.environ.get('DISPLAY'):
+        print("没有 DISPLAY，跳过窗口测量（可用 xvfb-run 运行）")
+        return
+    probes = [run_probe() for _ in range(args.repeat)]
+    window = statistics.median(p['window_sec'] for p in probes)
+    ready = statistics.median(p['ready_sec'] for p in probes)
+    print(f"新版：窗口出现 {window:.2f}s，后台预热完成 {ready:.2f}s（中位数，{args.repeat} 次）")
+    print(f"窗口出现提前 {statistics.median(eager) - window:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
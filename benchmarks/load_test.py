@@ -0,0 +1,106 @@
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIXTURE = os.path.join(ROOT, 'test_meeting.wav')
+
+
+# 转写服务压测：分别以批量模式和逐个模式启动 service.py，用同一组短录音
+# （从 test_meeting.wav 截取或循环拼接的语音备忘、1–3 分钟站会）并发请求，
+# 比较吞吐量（每秒处理的音频分钟数）和请求延迟。
+def make_clips(lengths):
+    import numpy as np
+    import soundfile as sf
+    from pipeline import load_audio
+    audio = load_audio(FIXTURE)
+    clips = []
+    for sec in lengths:
+        n = int(sec * 16000)
+        data = np.resize(audio, n)
+        buf = io.BytesIO()
+        sf.write(buf, data, 16000, format='WAV', subtype='PCM_16')
+        clips.append((sec, buf.getvalue()))
+    return clips
+
+
+def start_service(port, model, extra):
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, 'service.py'), '--port', str(port),
+                             '-m', model, *extra], cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    # 等模型加载完、打印出启动信息
+    line = proc.stdout.readline()
+    if '已启动' not in line:
+        proc.kill()
+        raise RuntimeError("转写服务启动失败")
+    return proc
+
+
+def post(url, data):
+    started = time.perf_counter()
+    with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=3600) as r:
+        json.loads(r.read())
+    return time.perf_counter() - started
+
+
+def run_load(port, model, clips, concurrency):
+    url = f"http://127.0.0.1:{port}/transcribe?model={model}"
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(lambda clip: post(url, clip[1]), clips))
+    wall = time.perf_counter() - started
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/health") as r:
+        health = json.loads(r.read())
+    return wall, latencies, health
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比较转写服务批量与逐个模式的吞吐量")
+    parser.add_argument('-m', '--model', default='base')
+    parser.add_argument('-n', '--requests', type=int, default=24, help="请求总数")
+    parser.add_argument('-c', '--concurrency', type=int, default=8, help="并发客户端数")
+    parser.add_argument('--lengths', type=float, nargs='+', default=[15, 30, 60, 90, 180],
+                        help="录音时长（秒），轮流使用")
+    parser.add_argument('--max-batch', type=int, default=8)
+    parser.add_argument('--max-wait', type=float, default=0.2)
+    parser.add_argument('--port', type=int, default=8790)
+    args = parser.parse_args()
+
+    lengths = [args.lengths[i % len(args.lengths)] for i in range(args.requests)]
+    clips = make_clips(lengths)
+    total_min = sum(lengths) / 60
+    print(f"{args.requests} 个请求，共 {total_min:.1f} 分钟音频，并发 {args.concurrency}，模型 {args.model}")
+
+    modes = [('逐个', ['--no-batch']),
+             ('批量', ['--max-batch', str(args.max_batch), '--max-wait', str(args.max_wait)])]
+    results = {}
+    for label, extra in modes:
+        proc = start_service(args.port, args.model, extra)
+        try:
+            # 先发一个请求预热，不计入结果
+            post(f"http://127.0.0.1:{args.port}/transcribe?model={args.model}", clips[0][1])
+            wall, latencies, health = run_load(args.port, args.model, clips, args.concurrency)
+        finally:
+            proc.terminate()
+            proc.wait()
+        latencies.sort()
+        results[label] = wall
+        batch_info = ''
+        for stats in health['batchers'].values():
+            batch_info = f"，平均每批 {stats['avg_batch']} 窗"
+        print(f"{label}：耗时 {wall:.1f}s，吞吐 {total_min / wall * 60:.2f} 音频分钟/分钟，"
+              f"{args.requests / wall:.2f} 请求/秒，延迟 p50 {statistics.median(latencies):.1f}s "
+              f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.1f}s{batch_info}")
+    print(f"批量相对逐个的吞吐提升：{results['逐个'] / results['批量']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import json
+import os
+
+from pipeline import transcribe
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'checkpoints')
+SAMPLE_RATE = 16000
+
+
+class Cancelled(Exception):
+    pass
+
+
+# ── 分段断点续转 ────────────────────────────────────────────────
+# 长录音按 segment_sec 切段（在目标位置附近最安静处切开），逐段转写，
+# 每完成一段就往断点文件追加一行 JSON 并 fsync。进程中途退出后，用同一段
+# 音频、同样的设置再转写时，从断点文件里最后一个完成的段之后继续。
+# cancel 是一个 threading.Event，置位后在下一个段边界停下并抛出 Cancelled，
+# 已完成的段留在断点文件里。全部完成后删除断点文件。
+class Checkpoint:
+    def __init__(self, key, directory=DEFAULT_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{key}.jsonl")
+
+    def load(self, windows):
+        # 只认和本次切段完全一致的前缀，设置变了的旧断点作废
+        done = []
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line, (_, _, start, end) in zip(f, windows):
+                    entry = json.loads(line)
+                    if (entry['start'], entry['end']) != (start, end):
+                        break
+                    done.append(entry)
+        except (OSError, ValueError, KeyError):
+            pass
+        # 截掉不完整的尾行，后面接着追加
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(e, ensure_ascii=False) + '\n' for e in done)
+        return done
+
+    def append(self, entry):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def transcribe_resumable(model, audio, key, language='zh', segment_sec=120.0, cancel=None,
+                         progress=None, directory=DEFAULT_DIR, **options):
+    # progress(已完成段数, 总段数, 本次是否从断点恢复)
+    from parallel_transcribe import split_windows
+    windows = split_windows(audio, window_sec=segment_sec, overlap_sec=0)
+    checkpoint = Checkpoint(key, directory)
+    done = checkpoint.load(windows)
+    resumed = len(done)
+    if progress:
+        progress(len(done), len(windows), resumed)
+    for lo, hi, start, end in windows[len(done):]:
+        if cancel is not None and cancel.is_set():
+            raise Cancelled(f"已完成 {len(done)}/{len(windows)} 段，下次转写从断点继续")
+        prompt = ''.join(e['text'] for e in done)[-200:] or None
+        result = transcribe(model, audio[start:end], language=language, initial_prompt=prompt, **options)
+        offset = start / SAMPLE_RATE
+        entry = {
+            'start': start, 'end': end,
+            'text': result['text'],
+            'skipped_sec': result['skipped_sec'],
+            'segments': [{'start': s['start'] + offset, 'end': s['end'] + offset, 'text': s['text'].strip()}
+                         for s in result.get('segments', [])],
+        }
+        checkpoint.append(entry)
+        done.append(entry)
+        if progress:
+            progress(len(done), len(windows), resumed)
+    checkpoint.remove()
+    return {
+        'text': ''.join(e['text'] for e in done).strip(),
+        'segments': [s for e in done for s in e['segments']],
+        'skipped_sec': sum(e['skipped_sec'] for e in done),
+        'resumed_segments': resumed,
+    }
@@ -0,0 +1,150 @@
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse
+from xml.sax.saxutils import escape
+
+# ── 流式 Word 导出 ──────────────────────────────────────────────
+# 不经过 python-docx 的对象模型，直接把 WordprocessingML 逐段写进 zip。
+# 【...】小节标题用“标题 1”；只有【要点整理】和【待办事项】里“1. xxx”这样的行
+# 用自动编号列表，每个小节重新从 1 开始编号；其余段落（包括原始内容里以数字
+# 开头的句子，如“3.5亿元”“2024.10.18”）原样输出。纯分隔线不输出。
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+# 编号后必须跟空白（“、”除外），“3.5亿元”这样的小数不算编号
+_NUMBERED = re.compile(r'^\s*\d+(?:[.．]\s+|、\s*)')
+_LIST_SECTIONS = ('【要点整理】', '【待办事项】')
+_SECTION = re.compile(r'^\s*【.+】\s*$')
+_RULE = re.compile(r'^[━=─\-\s]+$')
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+<Override PartName="/word/numbering.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"/>
+</Types>"""
+
+_PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+_DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering" Target="numbering.xml"/>
+</Relationships>"""
+
+_STYLES = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:styles xmlns:w="{W_NS}">
+<w:docDefaults><w:rPrDefault><w:rPr>
+<w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:eastAsia="微软雅黑"/><w:sz w:val="21"/>
+</w:rPr></w:rPrDefault><w:pPrDefault><w:pPr><w:spacing w:after="60"/></w:pPr></w:pPrDefault></w:docDefaults>
+<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>
+<w:style w:type="paragraph" w:styleId="Title"><w:name w:val="Title"/><w:basedOn w:val="Normal"/>
+<w:pPr><w:jc w:val="center"/><w:spacing w:after="240"/></w:pPr><w:rPr><w:b/><w:sz w:val="44"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/><w:basedOn w:val="Normal"/>
+<w:pPr><w:keepNext/><w:spacing w:before="240" w:after="120"/><w:outlineLvl w:val="0"/></w:pPr>
+<w:rPr><w:b/><w:color w:val="1F4E79"/><w:sz w:val="28"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="ListParagraph"><w:name w:val="List Paragraph"/><w:basedOn w:val="Normal"/>
+<w:pPr><w:ind w:left="420"/></w:pPr></w:style>
+</w:styles>"""
+
+_ABSTRACT_NUM = """<w:abstractNum w:abstractNumId="0"><w:multiLevelType w:val="singleLevel"/>
+<w:lvl w:ilvl="0"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:lvlText w:val="%1."/>
+<w:lvlJc w:val="left"/><w:pPr><w:ind w:left="420" w:hanging="420"/></w:pPr></w:lvl></w:abstractNum>"""
+
+
+def _clean(text):
+    return escape(_INVALID_XML.sub('', text))
+
+
+def _paragraph(text, style=None, num_id=None):
+    ppr = ''
+    if style or num_id:
+        ppr = '<w:pPr>'
+        if style:
+            ppr += f'<w:pStyle w:val="{style}"/>'
+        if num_id:
+            ppr += f'<w:numPr><w:ilvl w:val="0"/><w:numId w:val="{num_id}"/></w:numPr>'
+        ppr += '</w:pPr>'
+    if not text:
+        return f'<w:p>{ppr}</w:p>'
+    return f'<w:p>{ppr}<w:r><w:t xml:space="preserve">{_clean(text)}</w:t></w:r></w:p>'
+
+
+def write_docx(text, dest, title='会议纪要'):
+    # dest 可以是文件路径或可写的二进制文件对象
+    num_ids = 0
+    with zipfile.ZipFile(dest, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        zf.writestr('_rels/.rels', _PACKAGE_RELS)
+        zf.writestr('word/_rels/document.xml.rels', _DOCUMENT_RELS)
+        zf.writestr('word/styles.xml', _STYLES)
+        with zf.open('word/document.xml', 'w') as doc:
+            doc.write(f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                      f'<w:document xmlns:w="{W_NS}"><w:body>'.encode('utf-8'))
+            batch = [_paragraph(title, 'Title')]
+            in_list = list_section = False
+            for line in text.split('\n'):
+                if _RULE.match(line) and line.strip():
+                    continue
+                if _SECTION.match(line):
+                    batch.append(_paragraph(line.strip(), 'Heading1'))
+                    in_list = False
+                    list_section = line.strip() in _LIST_SECTIONS
+                elif list_section and _NUMBERED.match(line):
+                    if not in_list:
+                        # 每个列表单独一个编号实例，从 1 重新开始
+                        num_ids += 1
+                        in_list = True
+                    batch.append(_paragraph(_NUMBERED.sub('', line, 1), 'ListParagraph', num_ids))
+                else:
+                    if line.strip():
+                        in_list = False
+                    batch.append(_paragraph(line))
+                if len(batch) >= 256:
+                    doc.write(''.join(batch).encode('utf-8'))
+                    batch = []
+            batch.append('<w:sectPr/></w:body></w:document>')
+            doc.write(''.join(batch).encode('utf-8'))
+        nums = ''.join(f'<w:num w:numId="{i}"><w:abstractNumId w:val="0"/>'
+                       f'<w:lvlOverride w:ilvl="0"><w:startOverride w:val="1"/></w:lvlOverride></w:num>'
+                       for i in range(1, num_ids + 1))
+        zf.writestr('word/numbering.xml',
+                    f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    f'<w:numbering xmlns:w="{W_NS}">{_ABSTRACT_NUM}{nums}</w:numbering>')
+
+
+# ── 流式 Word 导入 ──────────────────────────────────────────────
+# 用 iterparse 逐个 w:p 取文字，处理完立即释放，不加载整棵文档树。
+_P, _T, _TAB, _BR = (f'{{{W_NS}}}{tag}' for tag in ('p', 't', 'tab', 'br'))
+
+
+def iter_docx_paragraphs(source):
+    # source 可以是文件路径或二进制文件对象
+    with zipfile.ZipFile(source) as zf, zf.open('word/document.xml') as xml:
+        # 文本框里的段落会嵌套在外层段落中，用栈分别收集
+        stack = []
+        for event, elem in iterparse(xml, events=('start', 'end')):
+            if event == 'start':
+                if elem.tag == _P:
+                    stack.append([])
+                continue
+            if not stack:
+                continue
+            if elem.tag == _T:
+                stack[-1].append(elem.text or '')
+            elif elem.tag == _TAB:
+                stack[-1].append('\t')
+            elif elem.tag == _BR:
+                stack[-1].append('\n')
+            elif elem.tag == _P:
+                yield ''.join(stack.pop())
+                elem.clear()
+
+
+def read_docx_text(source):
+    return '\n'.join(p for p in iter_docx_paragraphs(source) if p.strip())
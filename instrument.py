@@ -0,0 +1,143 @@
+import json
+import logging
+import os
+import platform
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
+MB = 1024 * 1024
+
+
+def rss_mb():
+    # 当前进程常驻内存；Linux 读 /proc，Windows 调 psapi，其他平台尝试 psutil
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / MB
+    except (OSError, ValueError, AttributeError):
+        pass
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + \
+                       [(name, ctypes.c_size_t) for name in (
+                           'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage',
+                           'QuotaPagedPoolUsage', 'QuotaPeakNonPagedPoolUsage',
+                           'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(counters)
+        if ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(),
+                                                    ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize / MB
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / MB
+    except Exception:
+        return None
+
+
+# ── 任务计时 ────────────────────────────────────────────────────
+# 一次转写任务一个 JobMetrics，每个阶段用 with metrics.stage('xxx') 包起来，
+# 记录耗时、阶段内峰值内存（后台线程每 50 ms 采样一次），音频时长已知时
+# 再算出实时率。结束后 log_job() 追加一行 JSON 到本地滚动日志。
+class JobMetrics:
+    def __init__(self, frontend, model=None, audio_sec=None, **meta):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.frontend = frontend
+        self.model = model
+        self.audio_sec = audio_sec
+        self.meta = meta
+        self.stages = []
+        self.started = time.time()
+
+    @contextmanager
+    def stage(self, name):
+        peak = [rss_mb()]
+        stop = threading.Event()
+
+        def sample():
+            while not stop.wait(0.05):
+                current = rss_mb()
+                if current is not None and (peak[0] is None or current > peak[0]):
+                    peak[0] = current
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            stop.set()
+            sampler.join()
+            current = rss_mb()
+            if current is not None and (peak[0] is None or current > peak[0]):
+                peak[0] = current
+            self.stages.append({'stage': name, 'sec': round(elapsed, 3),
+                                'peak_mb': round(peak[0], 1) if peak[0] is not None else None})
+
+    @property
+    def total_sec(self):
+        return sum(s['sec'] for s in self.stages)
+
+    def rtf(self, sec):
+        return sec / self.audio_sec if self.audio_sec else None
+
+    def to_dict(self):
+        return {
+            'job_id': self.job_id,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'host': platform.node(),
+            'frontend': self.frontend,
+            'model': self.model,
+            'audio_sec': round(self.audio_sec, 2) if self.audio_sec else None,
+            'total_sec': round(self.total_sec, 3),
+            'rtf': round(self.rtf(self.total_sec), 4) if self.audio_sec else None,
+            'peak_mb': max((s['peak_mb'] for s in self.stages if s['peak_mb'] is not None), default=None),
+            'stages': [dict(s, rtf=round(self.rtf(s['sec']), 4) if self.audio_sec else None)
+                       for s in self.stages],
+            **self.meta,
+        }
+
+    def summary(self):
+        parts = [f"{s['stage']} {s['sec']:.1f}s" for s in self.stages]
+        if self.audio_sec:
+            parts.append(f"实时率 {self.rtf(self.total_sec):.2f}")
+        peak = self.to_dict()['peak_mb']
+        if peak:
+            parts.append(f"峰值内存 {peak:.0f}MB")
+        return "，".join(parts)
+
+
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def _job_logger():
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            os.makedirs(LOG_DIR, exist_ok=True)
+            _logger = logging.getLogger('meeting_minutes.jobs')
+            _logger.setLevel(logging.INFO)
+            _logger.propagate = False
+            handler = RotatingFileHandler(os.path.join(LOG_DIR, 'jobs.jsonl'), maxBytes=5 * MB,
+                                          backupCount=5, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            _logger.addHandler(handler)
+        return _logger
+
+
+def log_job(metrics, **extra):
+    try:
+        _job_logger().info(json.dumps(dict(metrics.to_dict(), **extra), ensure_ascii=False))
+    except Exception:
+        # 日志写不进去不影响转写本身
+        pass
@@ -0,0 +1,128 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class QueueFull(RuntimeError):
+    pass
+
+
+class Job:
+    def __init__(self, fn, args, kwargs, label=''):
+        self.id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.state = QUEUED
+        self.progress = 0.0
+        self.message = '排队中'
+        self.result = None
+        self.error = None
+        self.meta = {}
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        # 运行中的任务由任务函数自己检查这个标志，在合适的位置停下
+        self.cancel_event = threading.Event()
+        self._fn, self._args, self._kwargs = fn, args, kwargs
+
+    def update(self, progress=None, message=None):
+        # 任务函数在工作线程里调用，界面轮询时读取
+        if progress is not None:
+            self.progress = min(max(progress, 0.0), 1.0)
+        if message is not None:
+            self.message = message
+
+    @property
+    def done(self):
+        return self.state in FINISHED
+
+
+# ── 进程级任务队列 ──────────────────────────────────────────────
+# 所有会话的转写任务按提交顺序排队，由固定数量的工作线程执行，
+# 同时跑的任务数不超过 workers，排队的超过 max_queued 时直接拒绝，
+# 负载高时等待时间线性增长，而不是所有人一起抢同一个模型。
+# 任务结果保留 keep_sec 秒，用户离开页面再回来也能凭任务 ID 取回。
+class JobQueue:
+    def __init__(self, workers=1, max_queued=20, keep_sec=3600):
+        self.max_queued = max_queued
+        self.keep_sec = keep_sec
+        self._jobs = OrderedDict()
+        self._waiting = deque()
+        self._cond = threading.Condition()
+        for i in range(workers):
+            threading.Thread(target=self._run, name=f'job-worker-{i}', daemon=True).start()
+
+    def submit(self, fn, *args, label='', **kwargs):
+        # fn(job, *args, **kwargs) 的返回值存为 job.result
+        job = Job(fn, args, kwargs, label)
+        with self._cond:
+            self._expire()
+            if len(self._waiting) >= self.max_queued:
+                raise QueueFull(f"当前排队任务已达 {self.max_queued} 个")
+            self._jobs[job.id] = job
+            self._waiting.append(job)
+            self._cond.notify()
+        return job
+
+    def get(self, job_id):
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def position(self, job_id):
+        # 排在第几位（1 起），已开始或不存在时返回 0
+        with self._cond:
+            for i, job in enumerate(self._waiting, 1):
+                if job.id == job_id:
+                    return i
+        return 0
+
+    def cancel(self, job_id):
+        # 排队中的任务直接移出队列；运行中的只发出取消请求，由任务函数响应
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.done:
+                return False
+            job.cancel_event.set()
+            if job.state == QUEUED:
+                self._waiting.remove(job)
+                job.finished = time.time()
+                job.state, job.message = CANCELLED, '已取消'
+            else:
+                job.message = '正在取消'
+            return True
+
+    def stats(self):
+        with self._cond:
+            states = [job.state for job in self._jobs.values()]
+        return {state: states.count(state) for state in (QUEUED, RUNNING, DONE, FAILED, CANCELLED)}
+
+    def _expire(self):
+        cutoff = time.time() - self.keep_sec
+        for job_id in [j.id for j in self._jobs.values() if j.done and j.finished < cutoff]:
+            del self._jobs[job_id]
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._waiting:
+                    self._cond.wait()
+                job = self._waiting.popleft()
+                job.state, job.started, job.message = RUNNING, time.time(), '开始处理'
+            try:
+                result, error = job._fn(job, *job._args, **job._kwargs), None
+            except Exception as e:
+                result, error = None, e
+            # 输入数据（可能是整段音频）用完就释放，只留结果
+            job._fn = job._args = job._kwargs = None
+            job.finished = time.time()
+            if error is None:
+                job.result = result
+                job.state, job.progress, job.message = DONE, 1.0, '已完成'
+            elif job.cancel_event.is_set():
+                job.state, job.message = CANCELLED, f"已取消：{error}"
+            else:
+                job.error = error
+                job.state, job.message = FAILED, f"失败：{error}"
@@ -0,0 +1,109 @@
+import threading
+import queue
+
+import numpy as np
+
+from pipeline import transcribe
+
+
+# ── 边录边转 ────────────────────────────────────────────────────
+# 录音线程把采集到的小块音频 feed() 进来，后台线程攒够一个窗口后，
+# 在窗口尾部找一段最安静的位置切开，把切出来的这一段先转写掉。
+# 停止录音后 finish() 只需要处理最后剩下的一小段。
+# 转写比录音慢、积压超过 max_lag_sec 时放弃边录边转（记为 error，不再收音频），
+# 内存不随会议时长增长；录音本身照常落盘，停止后改为整段转写。
+class LiveTranscriber:
+    def __init__(self, get_model, sample_rate=16000, language='zh',
+                 window_sec=30.0, search_sec=5.0, frame_sec=0.1, max_lag_sec=120.0,
+                 model_name=None, profile=None, **options):
+        # options 原样传给 transcribe（解码档位的参数）；model_name、profile 只是记下来，
+        # 缓存结果时用开始录音时的设置
+        self.get_model = get_model
+        self.model_name = model_name
+        self.profile = profile
+        self.options = options
+        self.sample_rate = sample_rate
+        self.language = language
+        self.window_len = int(window_sec * sample_rate)
+        self.search_len = int(search_sec * sample_rate)
+        self.frame_len = int(frame_sec * sample_rate)
+        self.max_lag = int(max_lag_sec * sample_rate)
+
+        self.texts = []
+        self.skipped_sec = 0.0
+        self.error = None
+        self._queue = queue.Queue()
+        self._pending = []
+        self._pending_len = 0
+        self._backlog = 0
+        self._backlog_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def feed(self, chunk):
+        if self.error is not None:
+            return
+        chunk = np.asarray(chunk, dtype='float32').reshape(-1)
+        with self._backlog_lock:
+            if self._backlog + len(chunk) > self.max_lag:
+                self.error = RuntimeError(f"边录边转跟不上录音（积压超过 {self.max_lag / self.sample_rate:.0f} 秒）")
+                return
+            self._backlog += len(chunk)
+        self._queue.put(chunk)
+
+    def finish(self):
+        self._queue.put(None)
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+        if self._pending_len:
+            self._transcribe(np.concatenate(self._pending))
+            self._pending, self._pending_len = [], 0
+        return ''.join(self.texts).strip()
+
+    def transcribed_text(self):
+        return ''.join(self.texts).strip()
+
+    def _run(self):
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                return
+            with self._backlog_lock:
+                self._backlog -= len(chunk)
+            if self.error is not None:
+                continue
+            self._pending.append(chunk)
+            self._pending_len += len(chunk)
+            if self._pending_len < self.window_len:
+                continue
+            try:
+                buf = np.concatenate(self._pending)
+                cut = self._find_cut(buf)
+                self._transcribe(buf[:cut])
+                rest = buf[cut:]
+                self._pending = [rest] if len(rest) else []
+                self._pending_len = len(rest)
+            except Exception as e:
+                self.error = e
+
+    def _find_cut(self, buf):
+        # 在窗口最后 search_sec 秒里找能量最低的一帧，从它中间切开
+        start = max(len(buf) - self.search_len, 0)
+        tail = buf[start:]
+        n_frames = len(tail) // self.frame_len
+        if n_frames < 2:
+            return len(buf)
+        frames = tail[:n_frames * self.frame_len].reshape(n_frames, self.frame_len)
+        energy = np.square(frames).mean(axis=1)
+        quietest = int(np.argmin(energy))
+        return start + quietest * self.frame_len + self.frame_len // 2
+
+    def _transcribe(self, audio):
+        if len(audio) < self.frame_len:
+            return
+        prompt = ''.join(self.texts)[-200:] or None
+        result = transcribe(self.get_model(), audio, language=self.language,
+                            initial_prompt=prompt, **self.options)
+        self.skipped_sec += result['skipped_sec']
+        self.texts.append(result['text'])
@@ -1,35 +1,41 @@
+import time
+
+_STARTED = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import threading
 import os
+import sys
 import datetime
 
-# 检查并安装依赖
+from model_manager import manager, MODEL_SIZES
+from backends import BACKENDS, DEFAULT_BACKEND, model_name
+from profiles import PROFILES, DESKTOP_DEFAULT_PROFILE, get_profile, profile_options
+
+# numpy、scipy、sounddevice、whisper 等重模块都不在启动时导入：窗口先出来，
+# 随后后台线程预热，真正用到时各方法里再 import（已预热过就是一次字典查找）。
+HEAVY_MODULES = ('numpy', 'soundfile', 'sounddevice', 'pipeline', 'summarizer', 'recorder',
+                 'live_transcriber', 'parallel_transcribe', 'checkpoint', 'docx_stream', 'transcript_cache',
+                 'instrument')
+
+# 检查并安装依赖：只用 find_spec 查找模块，不真正导入
 def check_dependencies():
-    import subprocess, sys
+    import importlib.util
+    import subprocess
     packages = {
         'sounddevice': 'sounddevice',
         'soundfile': 'soundfile',
         'numpy': 'numpy',
+        'scipy': 'scipy',
         'whisper': 'openai-whisper',
-        'docx': 'python-docx',
     }
     mirror = '-i https://pypi.tuna.tsinghua.edu.cn/simple --trusted-host pypi.tuna.tsinghua.edu.cn'
     for module, package in packages.items():
-        try:
-            __import__(module)
-        except ImportError:
+        if importlib.util.find_spec(module) is None:
             print(f"正在安装 {package}...")
             subprocess.check_call(f'{sys.executable} -m pip install {package} {mirror}', shell=True)
 
-check_dependencies()
-
-import sounddevice as sd
-import soundfile as sf
-import numpy as np
-import whisper
-from docx import Document
-
 class MeetingMinutesApp:
     def __init__(self, root):
         self.root = root
@@ -37,14 +43,30 @@ class MeetingMinutesApp:
         self.root.geometry("700x680")
         self.root.configure(bg='#f0f0f0')
 
-        self.recording = False
-        self.audio_data = []
-        self.audio_array = None
+        self.recorder = None
         self.sample_rate = 16000
-        self.model = None
         self.audio_file = None
+        self.live = None
 
         self.build_ui()
+        self.startup = {}
+        self.root.after(0, self.on_first_frame)
+
+    def on_first_frame(self):
+        # 窗口已经画出来了，再开始预热模块、加载模型，第一次转写不用再等
+        self.startup['window_sec'] = time.perf_counter() - _STARTED
+        threading.Thread(target=self.warm_up, daemon=True).start()
+        manager.preload(self.model_name())
+
+    def warm_up(self):
+        import importlib
+        for name in HEAVY_MODULES:
+            try:
+                importlib.import_module(name)
+            except Exception:
+                # 缺模块时留到真正用到时再报错
+                pass
+        self.startup['ready_sec'] = time.perf_counter() - _STARTED
 
     def build_ui(self):
         title = tk.Label(self.root, text="🎙️ 会议纪要助手", font=('微软雅黑', 18, 'bold'),
@@ -87,15 +109,51 @@ class MeetingMinutesApp:
                                      padx=20, pady=8, relief='flat', cursor='hand2')
         self.btn_import_audio.grid(row=0, column=2, padx=8)
 
+        option_frame = tk.Frame(frame_record, bg='#f0f0f0')
+        option_frame.pack()
+
+        self.live_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(option_frame, text="边录边转写（停止录音后几秒即可出纪要）", variable=self.live_var,
+                       bg='#f0f0f0', font=('微软雅黑', 9)).grid(row=0, column=0, padx=5)
+
+        tk.Label(option_frame, text="识别模型：", bg='#f0f0f0', font=('微软雅黑', 9)).grid(row=0, column=1)
+        self.model_var = tk.StringVar(value='base')
+        tk.OptionMenu(option_frame, self.model_var, *MODEL_SIZES,
+                      command=lambda _: manager.preload(self.model_name())).grid(row=0, column=2)
+        # int8 量化后 small 的速度接近 float32 的 base
+        self.backend_var = tk.StringVar(value=DEFAULT_BACKEND)
+        tk.OptionMenu(option_frame, self.backend_var, *BACKENDS,
+                      command=lambda _: manager.preload(self.model_name())).grid(row=0, column=3)
+
+        # 换档位时模型跟着换成该档的默认尺寸；默认档位与加档位之前的桌面版设置一致
+        tk.Label(option_frame, text="解码档位：", bg='#f0f0f0', font=('微软雅黑', 9)).grid(row=1, column=1)
+        self.profile_var = tk.StringVar(value=DESKTOP_DEFAULT_PROFILE)
+        tk.OptionMenu(option_frame, self.profile_var, *PROFILES,
+                      command=self.select_profile).grid(row=1, column=2, columnspan=2, sticky='w')
+
+        self.parallel_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(option_frame, text="长录音多进程并行转写", variable=self.parallel_var,
+                       bg='#f0f0f0', font=('微软雅黑', 9)).grid(row=1, column=0, sticky='w', padx=5)
+
         self.status_label = tk.Label(frame_record, text="状态：待机", bg='#f0f0f0',
-                                      font=('微软雅黑', 10), fg='#666')
+                                      font=('微软雅黑', 10), fg='#666', wraplength=560, justify='left')
         self.status_label.pack(pady=5)
 
-        self.btn_transcribe = tk.Button(self.root, text="🔄 转文字并生成会议纪要",
+        transcribe_frame = tk.Frame(self.root, bg='#f0f0f0')
+        transcribe_frame.pack(pady=5)
+
+        self.btn_transcribe = tk.Button(transcribe_frame, text="🔄 转文字并生成会议纪要",
                                          command=self.transcribe_and_generate,
                                          bg='#FF9800', fg='white', font=('微软雅黑', 12, 'bold'),
                                          padx=30, pady=10, relief='flat', cursor='hand2', state='disabled')
-        self.btn_transcribe.pack(pady=5)
+        self.btn_transcribe.grid(row=0, column=0, padx=5)
+
+        # 取消后在下一个分段边界停下，已完成的分段留在断点文件里，再点转写从断点继续
+        self.cancel_event = threading.Event()
+        self.btn_cancel = tk.Button(transcribe_frame, text="✖ 取消", command=self.cancel_event.set,
+                                     bg='#9E9E9E', fg='white', font=('微软雅黑', 12, 'bold'),
+                                     padx=15, pady=10, relief='flat', cursor='hand2', state='disabled')
+        self.btn_cancel.grid(row=0, column=1, padx=5)
 
         # Word 导入
         frame_word = tk.LabelFrame(self.root, text="方式二：导入手写记录（Word/TXT）", font=('微软雅黑', 10),
@@ -138,37 +196,60 @@ class MeetingMinutesApp:
                                         padx=20, pady=8, relief='flat', cursor='hand2', state='disabled')
         self.btn_save_word.grid(row=0, column=1, padx=10)
 
+    def model_name(self):
+        return model_name(self.model_var.get(), self.backend_var.get())
+
+    def select_profile(self, profile):
+        self.model_var.set(get_profile(profile)['size'])
+        manager.preload(self.model_name())
+
     def start_recording(self):
-        self.recording = True
-        self.audio_data = []
-        self.audio_array = None
+        from live_transcriber import LiveTranscriber
+        from recorder import SpoolRecorder
+        self.audio_file = None
+        name, profile = self.model_name(), self.profile_var.get()
+        self.live = LiveTranscriber(lambda: manager.get(name), self.sample_rate, model_name=name, profile=profile,
+                                    **profile_options(profile)) if self.live_var.get() else None
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'temp_recording.wav')
+        self.recorder = SpoolRecorder(path, self.sample_rate,
+                                      on_chunk=self.live.feed if self.live else None)
+        try:
+            self.recorder.start()
+        except Exception as e:
+            self.recorder = None
+            messagebox.showerror("错误", f"无法开始录音：{str(e)}")
+            return
         self.btn_start.config(state='disabled')
         self.btn_stop.config(state='normal')
         self.btn_import_audio.config(state='disabled')
         self.status_label.config(text="状态：🔴 录音中...", fg='red')
 
-        def record():
-            with sd.InputStream(samplerate=self.sample_rate, channels=1, dtype='float32') as stream:
-                while self.recording:
-                    data, _ = stream.read(1024)
-                    self.audio_data.append(data.copy())
-
-        self.record_thread = threading.Thread(target=record, daemon=True)
-        self.record_thread.start()
-
     def stop_recording(self):
-        self.recording = False
-        self.btn_start.config(state='normal')
+        self.recorder.stop()
         self.btn_stop.config(state='disabled')
+        self.status_label.config(text="状态：⏳ 正在保存录音...", fg='blue')
+        self.wait_recorder()
+
+    def wait_recorder(self):
+        # 写盘线程收尾时不阻塞界面，轮询到写完再放开按钮
+        recorder = self.recorder
+        if not recorder.finished:
+            self.root.after(50, self.wait_recorder)
+            return
+        self.btn_start.config(state='normal')
         self.btn_import_audio.config(state='normal')
-
-        if self.audio_data:
-            audio_array = np.concatenate(self.audio_data, axis=0)
-            self.audio_array = audio_array
-            self.audio_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'temp_recording.wav')
-            sf.write(self.audio_file, audio_array, self.sample_rate)
+        if recorder.error is not None:
+            messagebox.showerror("错误", f"录音失败：{str(recorder.error)}")
+        if recorder.frames_written:
+            self.audio_file = recorder.path
             self.btn_transcribe.config(state='normal')
-            self.status_label.config(text=f"状态：✅ 录音已保存，时长约 {len(audio_array)/self.sample_rate:.1f} 秒", fg='green')
+            if recorder.overflows:
+                # 写盘线程跟不上时声卡数据被丢弃，录音里有空白，要让用户知道
+                self.status_label.config(
+                    text=f"状态：⚠️ 录音已保存，时长约 {recorder.duration:.1f} 秒，但有 {recorder.overflows} 处"
+                         f"共约 {recorder.dropped_sec:.1f} 秒没录上（电脑太忙，写盘跟不上）", fg='#E65100')
+            else:
+                self.status_label.config(text=f"状态：✅ 录音已保存，时长约 {recorder.duration:.1f} 秒", fg='green')
 
     def import_audio(self):
         file_path = filedialog.askopenfilename(
@@ -177,7 +258,7 @@ class MeetingMinutesApp:
         )
         if file_path:
             self.audio_file = file_path
-            self.audio_array = None
+            self.live = None
             self.btn_transcribe.config(state='normal')
             self.status_label.config(text=f"状态：✅ 已导入：{os.path.basename(file_path)}", fg='green')
 
@@ -191,8 +272,8 @@ class MeetingMinutesApp:
 
         try:
             if file_path.endswith('.docx'):
-                doc = Document(file_path)
-                text = '\n'.join([p.text for p in doc.paragraphs if p.text.strip()])
+                from docx_stream import read_docx_text
+                text = read_docx_text(file_path)
             else:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     text = f.read()
@@ -217,56 +298,126 @@ class MeetingMinutesApp:
         self.progress.start()
         self.status_label.config(text="状态：⏳ 正在加载语音识别模型...", fg='blue')
 
+        # 边录边转时以开始录音时选的模型和档位为准，录音中途改了选项也不影响
+        if self.live:
+            name, profile = self.live.model_name, self.live.profile
+        else:
+            name, profile = self.model_name(), self.profile_var.get()
+        parallel = self.parallel_var.get() and not self.live
+        # 边录边转中途出过错（模型加载失败、内存不足、跟不上录音），录音已经完整
+        # 落盘，改为读文件整段转写
+        live = self.live if self.live is not None and self.live.error is None else None
+        self.cancel_event.clear()
+
         def process():
+            nonlocal live
             try:
-                if self.model is None:
-                    self.model = whisper.load_model("base")
-
-                self.root.after(0, lambda: self.status_label.config(text="状态：⏳ 正在转写文字...", fg='blue'))
-
-                if self.audio_array is not None:
-                    audio_input = self.audio_array.flatten().astype('float32')
-                    if self.sample_rate != 16000:
-                        new_len = int(len(audio_input) / self.sample_rate * 16000)
-                        audio_input = np.interp(
-                            np.linspace(0, len(audio_input), new_len),
-                            np.arange(len(audio_input)), audio_input
-                        ).astype('float32')
+                from checkpoint import Cancelled, transcribe_resumable
+                from pipeline import load_audio
+                from parallel_transcribe import transcribe_parallel
+                from transcript_cache import cache, audio_digest
+                from instrument import JobMetrics, log_job
+                # 同一段音频、同样的模型和参数转写过，就直接用缓存结果
+                decode = profile_options(profile)
+                options = dict(decode, vad=True)
+                if live:
+                    options['live'] = True
+                elif parallel:
+                    options['parallel'] = True
+                metrics = JobMetrics('desktop', model=name, profile=profile, live=bool(live), parallel=parallel)
+                if self.live is not None and live is None:
+                    metrics.meta['live_error'] = str(self.live.error)
+                recorder = self.recorder
+                if recorder is not None and self.audio_file == recorder.path:
+                    metrics.meta.update(overflows=recorder.overflows, dropped_sec=round(recorder.dropped_sec, 2))
+                with metrics.stage('hash'):
+                    digest = audio_digest(self.audio_file)
+                    key = cache.key(digest, name, 'zh', options)
+                    entry = cache.get(key)
+                if entry is not None:
+                    transcript, skipped = entry['text'], entry.get('skipped_sec', 0.0)
+                    metrics.audio_sec = entry.get('audio_sec')
+                    metrics.meta['cached'] = True
                 else:
-                    data, sr = sf.read(self.audio_file, dtype='float32')
-                    if data.ndim > 1:
-                        data = data.mean(axis=1)
-                    if sr != 16000:
-                        new_len = int(len(data) / sr * 16000)
-                        audio_input = np.interp(
-                            np.linspace(0, len(data), new_len),
-                            np.arange(len(data)), data
-                        ).astype('float32')
-                    else:
-                        audio_input = data
-
-                result = self.model.transcribe(audio_input, language='zh')
-                transcript = result['text'].strip()
-                minutes = self.generate_minutes(transcript, source="语音转写")
-                self.root.after(0, lambda: self.show_result(minutes))
-
+                    if live:
+                        # 录音期间已经转写了大部分内容，这里只补最后一段；模型录音时已经
+                        # 加载过，不再取一次，以免挤掉正在用的模型
+                        self.root.after(0, lambda: self.status_label.config(
+                            text=f"状态：⏳ 正在转写文字...（模型 {name}，边录边转）", fg='blue'))
+                        try:
+                            with metrics.stage('transcribe'):
+                                transcript = live.finish()
+                            skipped = live.skipped_sec
+                            metrics.audio_sec = self.recorder.duration
+                        except Exception as e:
+                            live = None
+                            metrics.meta['live_error'] = str(e)
+                            options.pop('live')
+                            key = cache.key(digest, name, 'zh', options)
+                    if not live:
+                        if parallel:
+                            info = f"模型 {name}，多进程并行"
+                        else:
+                            with metrics.stage('load_model'):
+                                model = manager.get(name)
+                            info = f"模型 {name}，加载 {manager.load_times.get(name, 0):.1f} 秒，常驻 {manager.resident_mb():.0f} MB"
+                        if 'live_error' in metrics.meta:
+                            info += "；边录边转出错，改为整段转写"
+                        self.root.after(0, lambda: self.status_label.config(text=f"状态：⏳ 正在转写文字...（{info}）", fg='blue'))
+                        with metrics.stage('decode'):
+                            audio_input = load_audio(self.audio_file)
+                        metrics.audio_sec = len(audio_input) / self.sample_rate
+                        with metrics.stage('transcribe'):
+                            if parallel:
+                                # 各工作进程自己加载模型，切窗并行转写后再拼接
+                                result = transcribe_parallel(audio_input, name, language='zh', **decode)
+                            else:
+                                self.root.after(0, lambda: self.btn_cancel.config(state='normal'))
+                                result = transcribe_resumable(model, audio_input, key, language='zh',
+                                                              cancel=self.cancel_event,
+                                                              progress=self.show_segment_progress, **decode)
+                        transcript, skipped = result['text'], result['skipped_sec']
+                    cache.put(key, transcript, model=name, language='zh', skipped_sec=skipped,
+                              audio_sec=metrics.audio_sec)
+
+                with metrics.stage('minutes'):
+                    minutes = self.generate_minutes(transcript, source="语音转写")
+                log_job(metrics, skipped_sec=round(skipped, 2))
+                note = f"（跳过静音 {skipped:.1f} 秒；{metrics.summary()}）"
+                if metrics.meta.get('overflows'):
+                    note += f"⚠️ 录音有 {metrics.meta['overflows']} 处共约 {metrics.meta['dropped_sec']:.1f} 秒丢失"
+                self.root.after(0, lambda: self.show_result(minutes, note=note))
+
+            except Cancelled as e:
+                self.root.after(0, lambda msg=str(e): self.status_label.config(text=f"状态：⏹ 已取消，{msg}", fg='#666'))
+                self.root.after(0, lambda: self.btn_transcribe.config(state='normal'))
             except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror("错误", f"处理失败：{str(e)}"))
+                self.root.after(0, lambda msg=str(e): messagebox.showerror("错误", f"处理失败：{msg}"))
                 self.root.after(0, lambda: self.btn_transcribe.config(state='normal'))
             finally:
                 self.root.after(0, self.progress.stop)
+                self.root.after(0, lambda: self.btn_cancel.config(state='disabled'))
 
         threading.Thread(target=process, daemon=True).start()
 
+    def show_segment_progress(self, done, total, resumed):
+        # 在转写线程里调用，界面更新交给主线程
+        note = f"，从第 {resumed + 1} 段继续" if resumed else ""
+        self.root.after(0, lambda: self.status_label.config(
+            text=f"状态：⏳ 正在转写文字...（已完成 {done}/{total} 段{note}）", fg='blue'))
+
     def generate_minutes(self, content, source=""):
         now = datetime.datetime.now()
         date_str = now.strftime("%Y年%m月%d日 %H:%M")
+        from summarizer import split_sentences, key_points, action_items
         attendees = self.attendees_var.get() or "（未填写）"
         topic = self.topic_var.get() or "（未填写）"
 
-        sentences = [s.strip() for s in content.replace('。', '。\n').replace('！', '！\n').replace('？', '？\n').replace('\n', '\n').split('\n') if s.strip()]
+        sentences = split_sentences(content)
+        points = key_points(sentences)
+        todos = action_items(sentences)
 
-        minutes = f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+        parts = [f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         会 议 纪 要
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -285,31 +436,33 @@ class MeetingMinutesApp:
 【要点整理】
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-"""
-        for i, sentence in enumerate(sentences[:15], 1):
-            if sentence:
-                minutes += f"{i}. {sentence}\n"
+"""]
+        parts.extend(f"{i}. {sentence}\n" for i, sentence in enumerate(points, 1))
 
-        minutes += f"""
+        parts.append("""
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 【待办事项】
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-（请手动补充待办事项）
+""")
+        parts.extend(f"{i}. {sentence}\n" for i, sentence in enumerate(todos, 1))
+        if not todos:
+            parts.append("（请手动补充待办事项）\n")
 
+        parts.append(f"""
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 记录人：自动生成  |  生成时间：{date_str}
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-"""
-        return minutes
+""")
+        return ''.join(parts)
 
-    def show_result(self, minutes):
+    def show_result(self, minutes, note=""):
         self.result_text.delete('1.0', tk.END)
         self.result_text.insert('1.0', minutes)
         self.btn_save_txt.config(state='normal')
         self.btn_save_word.config(state='normal')
         self.btn_transcribe.config(state='normal')
-        self.status_label.config(text="状态：✅ 会议纪要生成完成！", fg='green')
+        self.status_label.config(text=f"状态：✅ 会议纪要生成完成！{note}", fg='green')
 
     def save_minutes(self, fmt):
         now = datetime.datetime.now().strftime("%Y%m%d_%H%M")
@@ -333,15 +486,25 @@ class MeetingMinutesApp:
                 filetypes=[("Word文件", "*.docx")]
             )
             if file_path:
-                doc = Document()
-                doc.add_heading('会议纪要', 0)
-                for line in content.split('\n'):
-                    doc.add_paragraph(line)
-                doc.save(file_path)
+                from docx_stream import write_docx
+                write_docx(content, file_path)
                 messagebox.showinfo("成功", f"已保存到：\n{file_path}")
 
 
+def probe_startup(app):
+    # --startup-probe：等预热完成后打印启动耗时（JSON）并退出，供 benchmarks/bench_startup.py 使用
+    if 'ready_sec' not in app.startup:
+        app.root.after(20, probe_startup, app)
+        return
+    import json
+    print(json.dumps({k: round(v, 3) for k, v in app.startup.items()}), flush=True)
+    app.root.destroy()
+
+
 if __name__ == '__main__':
+    check_dependencies()
     root = tk.Tk()
     app = MeetingMinutesApp(root)
+    if '--startup-probe' in sys.argv:
+        root.after(0, probe_startup, app)
     root.mainloop()
@@ -0,0 +1,35 @@
+import re
+
+import numpy as np
+
+_IGNORED = re.compile(r'[\s，。！？、；：,.!?;:"“”‘’\'（）()《》【】\-—…]+')
+
+
+def normalize_text(text):
+    return _IGNORED.sub('', text).lower()
+
+
+def edit_distance(ref, hyp):
+    # 逐行 Levenshtein，行内用累计最小值把依赖左侧格子的那一项向量化
+    if not ref:
+        return len(hyp)
+    if not hyp:
+        return len(ref)
+    hyp_codes = np.frombuffer(hyp.encode('utf-32-le'), dtype=np.uint32)
+    steps = np.arange(len(hyp) + 1)
+    prev = steps.copy()
+    for i, ch in enumerate(ref, 1):
+        cost = (hyp_codes != ord(ch)).astype(np.int64)
+        cur = np.empty_like(prev)
+        cur[0] = i
+        cur[1:] = np.minimum(prev[1:] + 1, prev[:-1] + cost)
+        prev = np.minimum.accumulate(cur - steps) + steps
+    return int(prev[-1])
+
+
+def char_error_rate(ref, hyp):
+    # 中文按字计算错误率，标点和空白不计
+    ref, hyp = normalize_text(ref), normalize_text(hyp)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    return edit_distance(ref, hyp) / len(ref)
@@ -0,0 +1,154 @@
+import gc
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from backends import estimate_mb, load_model, parse_model_name
+
+MODEL_SIZES = ('tiny', 'base', 'small')
+
+
+def _tensor_bytes(value):
+    if isinstance(value, (tuple, list)):
+        return sum(_tensor_bytes(v) for v in value)
+    if hasattr(value, 'element_size'):
+        return value.numel() * value.element_size()
+    return 0
+
+
+def model_size_mb(model):
+    # 按 state_dict 统计，量化层打包后的权重不在 parameters() 里
+    return sum(_tensor_bytes(v) for v in model.state_dict().values()) / 1024 / 1024
+
+
+# ── Whisper 模型管理 ─────────────────────────────────────────────
+# 两个前端共用：启动时后台预加载，按最近使用保留少量模型，
+# 超过个数或内存上限时淘汰最久没用的那个。
+class ModelManager:
+    def __init__(self, max_models=2, max_mb=2048, loader=None):
+        self.max_models = max_models
+        self.max_mb = max_mb
+        self.loader = loader
+        self.load_times = {}
+        self.sizes = {}
+        self.errors = {}
+        self._models = OrderedDict()
+        self._loading = {}
+        self._use_locks = {}
+        self._lock = threading.Lock()
+
+    def _load(self, name):
+        if self.loader is not None:
+            return self.loader(name)
+        return load_model(name)
+
+    def preload(self, name):
+        with self._lock:
+            if name in self._models or name in self._loading:
+                return
+        threading.Thread(target=self._preload, args=(name,), daemon=True).start()
+
+    def _preload(self, name):
+        try:
+            self.get(name)
+        except Exception:
+            pass
+
+    def is_loaded(self, name):
+        with self._lock:
+            return name in self._models
+
+    def get(self, name):
+        size, _ = parse_model_name(name)
+        if size not in MODEL_SIZES:
+            raise ValueError(f"不支持的模型：{name}")
+        while True:
+            with self._lock:
+                if name in self._models:
+                    self._models.move_to_end(name)
+                    return self._models[name]
+                event = self._loading.get(name)
+                owner = event is None
+                if owner:
+                    event = self._loading[name] = threading.Event()
+            if not owner:
+                # 别的线程正在加载同一个模型，等它完成再取
+                event.wait()
+                if name in self.errors:
+                    raise self.errors[name]
+                continue
+            try:
+                self._make_room(estimate_mb(name))
+                started = time.perf_counter()
+                model = self._load(name)
+                with self._lock:
+                    self.load_times[name] = time.perf_counter() - started
+                    self.sizes[name] = model_size_mb(model)
+                    self._models[name] = model
+                    self.errors.pop(name, None)
+                self._make_room(0, keep=name)
+                return model
+            except Exception as e:
+                self.errors[name] = e
+                raise
+            finally:
+                with self._lock:
+                    self._loading.pop(name, None)
+                event.set()
+
+    @contextmanager
+    def use(self, name):
+        # Whisper 解码时在共享模块上挂 kv-cache 钩子，同一个模型实例不能
+        # 两个线程同时解码；多个工作线程用同一个模型时在这里排队
+        model = self.get(name)
+        with self._lock:
+            lock = self._use_locks.setdefault(name, threading.Lock())
+        with lock:
+            yield model
+
+    def _make_room(self, incoming_mb, keep=None):
+        evicted = []
+        with self._lock:
+            while self._models:
+                resident = sum(self.sizes.get(n, 0) for n in self._models)
+                count = len(self._models) + (1 if incoming_mb else 0)
+                if count <= self.max_models and resident + incoming_mb <= self.max_mb:
+                    break
+                oldest = next(iter(self._models))
+                if oldest == keep:
+                    break
+                evicted.append(self._models.pop(oldest))
+                self.sizes.pop(oldest, None)
+        if evicted:
+            del evicted
+            gc.collect()
+            try:
+                import torch
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+            except ImportError:
+                pass
+
+    def evict(self, name):
+        with self._lock:
+            model = self._models.pop(name, None)
+            self.sizes.pop(name, None)
+        if model is not None:
+            del model
+            gc.collect()
+
+    def stats(self):
+        with self._lock:
+            return [{
+                'name': name,
+                'load_sec': self.load_times.get(name),
+                'size_mb': self.sizes.get(name),
+            } for name in reversed(self._models)]
+
+    def resident_mb(self):
+        with self._lock:
+            return sum(self.sizes.get(n, 0) for n in self._models)
+
+
+manager = ModelManager()
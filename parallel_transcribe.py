@@ -0,0 +1,141 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from pipeline import load_audio, transcribe
+
+SAMPLE_RATE = 16000
+
+# 每个工作进程只加载一次模型
+_model = None
+
+
+def _init_worker(model_name, threads):
+    global _model
+    from backends import load_model, set_threads
+    set_threads(threads, 1)
+    _model = load_model(model_name)
+
+
+def _transcribe_window(audio, offset, language, options):
+    result = transcribe(_model, audio, language=language, **options)
+    segments = [{'start': seg['start'] + offset, 'end': seg['end'] + offset,
+                 'text': seg['text'].strip()} for seg in result.get('segments', [])]
+    return result['text'], segments, result['skipped_sec']
+
+
+# ── 切窗 ────────────────────────────────────────────────────────
+# 每隔 window_sec 在目标位置前后 search_sec 内找最安静的 0.1 秒作为边界，
+# 相邻两个窗口再各自向外多带 overlap_sec，拼接时去掉重叠部分的重复内容。
+def split_windows(audio, sr=SAMPLE_RATE, window_sec=120.0, overlap_sec=3.0,
+                  search_sec=10.0, frame_sec=0.1):
+    frame_len = int(frame_sec * sr)
+    n_frames = len(audio) // frame_len
+    energy = np.square(audio[:n_frames * frame_len].reshape(n_frames, frame_len)).mean(axis=1)
+
+    cuts = [0]
+    target = window_sec
+    while target + window_sec / 4 < len(audio) / sr:
+        lo = max(int((target - search_sec) / frame_sec), 0)
+        hi = min(int((target + search_sec) / frame_sec), n_frames)
+        if hi <= lo:
+            break
+        quietest = lo + int(np.argmin(energy[lo:hi]))
+        cut = quietest * frame_len + frame_len // 2
+        cuts.append(cut)
+        target = cut / sr + window_sec
+    cuts.append(len(audio))
+
+    overlap = int(overlap_sec * sr)
+    windows = []
+    for start, end in zip(cuts[:-1], cuts[1:]):
+        lo = max(start - overlap, 0)
+        hi = min(end + overlap, len(audio))
+        windows.append((lo, hi, start, end))
+    return windows
+
+
+# ── 拼接 ────────────────────────────────────────────────────────
+def _dedupe_join(prev, nxt, max_overlap=60, min_match=4):
+    # 只有前一段的结尾恰好等于后一段的开头才算重叠，只保留一份；
+    # 中间某处碰巧相同的几个字（“我们可以”之类）不算，两段原样相接
+    for size in range(min(max_overlap, len(prev), len(nxt)), min_match - 1, -1):
+        if prev.endswith(nxt[:size]):
+            return prev + nxt[size:]
+    return prev + nxt
+
+
+def stitch(results, windows):
+    # 有时间戳时按窗口自身的 [start, end) 归属保留分段，重叠区已经去掉；
+    # 相邻两段只要有一段没有时间戳，才退回文本去重
+    pieces = []
+    for (text, segments, _), (_, _, start, end) in zip(results, windows):
+        if segments:
+            kept = [seg['text'] for seg in segments
+                    if start / SAMPLE_RATE <= (seg['start'] + seg['end']) / 2 < end / SAMPLE_RATE]
+            pieces.append((''.join(kept), True))
+        else:
+            pieces.append((text, False))
+    merged, prev_timed = '', True
+    for piece, timed in pieces:
+        if merged and not (prev_timed and timed):
+            merged = _dedupe_join(merged, piece)
+        else:
+            merged += piece
+        prev_timed = timed
+    return merged.strip()
+
+
+def transcribe_parallel(audio, model_name='base', workers=None, language='zh',
+                        window_sec=120.0, overlap_sec=3.0, **options):
+    workers = workers or max((os.cpu_count() or 2) // 2, 1)
+    windows = split_windows(audio, window_sec=window_sec, overlap_sec=overlap_sec)
+    workers = min(workers, len(windows))
+    threads = max((os.cpu_count() or 1) // workers, 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(model_name, threads)) as pool:
+        futures = [pool.submit(_transcribe_window, audio[lo:hi], lo / SAMPLE_RATE, language, options)
+                   for lo, hi, _, _ in windows]
+        results = [f.result() for f in futures]
+    # 重叠区被两个窗口各算了一次，跳过的静音按窗口自身范围折算
+    skipped = sum(r[2] * (end - start) / (hi - lo)
+                  for r, (lo, hi, start, end) in zip(results, windows))
+    return {'text': stitch(results, windows), 'skipped_sec': skipped, 'windows': len(windows)}
+
+
+def main(argv=None):
+    from metrics import char_error_rate
+    parser = argparse.ArgumentParser(description="多进程并行转写单个长录音，并与串行结果对比")
+    parser.add_argument('audio', help="音频文件")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="工作进程数")
+    parser.add_argument('-m', '--model', default='base', help="Whisper 模型，如 base、small-int8（int8 量化）")
+    parser.add_argument('-w', '--window', type=float, default=120.0, help="窗口长度（秒）")
+    parser.add_argument('--compare', action='store_true', help="同时跑一遍串行转写并计算字错误率差异")
+    args = parser.parse_args(argv)
+
+    audio = load_audio(args.audio)
+    started = time.perf_counter()
+    result = transcribe_parallel(audio, args.model, args.workers, window_sec=args.window)
+    parallel_sec = time.perf_counter() - started
+    print(f"并行：{result['windows']} 个窗口，耗时 {parallel_sec:.1f} 秒，"
+          f"实时率 {parallel_sec / (len(audio) / SAMPLE_RATE):.3f}")
+
+    if args.compare:
+        from backends import load_model
+        model = load_model(args.model)
+        started = time.perf_counter()
+        serial = transcribe(model, audio, language='zh')
+        serial_sec = time.perf_counter() - started
+        print(f"串行：耗时 {serial_sec:.1f} 秒，加速比 {serial_sec / parallel_sec:.2f}x")
+        print(f"并行相对串行的字错误率：{char_error_rate(serial['text'], result['text']):.2%}")
+    else:
+        print(result['text'])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import datetime
+import io
+import math
+
+import numpy as np
+
+
+# ── 音频解码 ────────────────────────────────────────────────────
+# 按块读取 → 混成单声道 → 多相滤波重采样，每次只处理一块加上两侧少量
+# 上下文，内存占用与文件长度无关；结果与整段 resample_poly 逐点一致。
+def _open_audio(source):
+    import soundfile as sf
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    elif hasattr(source, 'seek'):
+        source.seek(0)
+    return sf.SoundFile(source)
+
+
+def _resample_ratio(sr, target_sr):
+    g = math.gcd(sr, target_sr)
+    return target_sr // g, sr // g
+
+
+def resample_stream(blocks, sr, target_sr=16000):
+    from scipy.signal import resample_poly
+    if sr == target_sr:
+        yield from blocks
+        return
+    up, down = _resample_ratio(sr, target_sr)
+    # resample_poly 默认滤波器半长为 10*max(up, down)（上采样后的点数），
+    # 换算成输入点数后向上取整到 down 的整数倍，保证每块输出的相位对齐
+    pad = (math.ceil(10 * max(up, down) / up / down) + 1) * down
+    buf = np.zeros(0, dtype='float32')
+    left = 0
+    for block in blocks:
+        buf = np.concatenate([buf, block])
+        n = (len(buf) - pad - left) // down * down
+        if n <= 0:
+            continue
+        y = resample_poly(buf[:left + n + pad], up, down)
+        yield y[left * up // down:(left + n) * up // down].astype('float32')
+        keep = max(left + n - pad, 0)
+        buf = buf[keep:]
+        left = left + n - keep
+    if len(buf) > left:
+        y = resample_poly(buf, up, down)
+        yield y[left * up // down:].astype('float32')
+
+
+def iter_audio(source, target_sr=16000, block_sec=30.0):
+    # source 可以是文件路径、类文件对象或 bytes，逐块产出单声道 16 kHz float32
+    with _open_audio(source) as f:
+        blocks = (b.mean(axis=1) for b in
+                  f.blocks(blocksize=int(block_sec * f.samplerate), dtype='float32', always_2d=True))
+        yield from resample_stream(blocks, f.samplerate, target_sr)
+
+
+def load_audio(source, target_sr=16000):
+    # 按最终长度预先分配，边解码边填，避免先攒列表再拼接
+    with _open_audio(source) as f:
+        up, down = _resample_ratio(f.samplerate, target_sr)
+        total = -(-f.frames * up // down)
+    out = np.empty(total, dtype='float32')
+    pos = 0
+    for chunk in iter_audio(source, target_sr):
+        if pos + len(chunk) > len(out):
+            # 部分压缩格式报告的帧数不准，不够时再扩
+            out = np.resize(out, pos + len(chunk))
+        out[pos:pos + len(chunk)] = chunk
+        pos += len(chunk)
+    return out[:pos]
+
+
+def transcribe(model, audio, language='zh', vad=True, **options):
+    # 先用 VAD 去掉静音，只把语音片段送进模型，再把时间戳换回原始音频
+    if not vad:
+        result = model.transcribe(audio, language=language, **options)
+        return dict(result, text=result['text'].strip(), skipped_sec=0.0)
+    from vad import detect_speech, SpeechMap
+    speech_map = SpeechMap(detect_speech(audio), len(audio))
+    if not speech_map.regions:
+        return {'text': '', 'segments': [], 'language': language,
+                'skipped_sec': speech_map.skipped_sec}
+    result = model.transcribe(speech_map.compact(audio), language=language, **options)
+    return dict(result, text=result['text'].strip(),
+                segments=speech_map.remap_segments(result.get('segments', [])),
+                skipped_sec=speech_map.skipped_sec)
+
+
+# ── 生成纪要 ────────────────────────────────────────────────────
+def generate_minutes(content, attendees, topic, source):
+    from summarizer import split_sentences, key_points, action_items
+    now = datetime.datetime.now()
+    date_str = now.strftime("%Y年%m月%d日 %H:%M")
+    sentences = split_sentences(content)
+    points = key_points(sentences)
+    todos = action_items(sentences)
+    parts = [f"""会议纪要
+{'='*40}
+会议时间：{date_str}
+参会人员：{attendees or '（未填写）'}
+会议主题：{topic or '（未填写）'}
+来　　源：{source}
+
+【原始内容】
+{content}
+
+【要点整理】
+"""]
+    parts.extend(f"{i}. {s}\n" for i, s in enumerate(points, 1))
+    parts.append("\n【待办事项】\n")
+    parts.extend(f"{i}. {s}\n" for i, s in enumerate(todos, 1))
+    if not todos:
+        parts.append("（请手动补充）\n")
+    parts.append(f"\n{'='*40}\n生成时间：{date_str}\n")
+    return ''.join(parts)
+
+
+def minutes_to_docx(text):
+    from docx_stream import write_docx
+    buf = io.BytesIO()
+    write_docx(text, buf)
+    buf.seek(0)
+    return buf
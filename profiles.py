@@ -0,0 +1,61 @@
+# ── 解码档位 ────────────────────────────────────────────────────
+# 把模型尺寸和 Whisper 解码参数打包成档位，两个前端都只让用户选档位：
+#   beam_size/best_of              None 为贪心解码，数字为束搜索宽度 / 采样候选数
+#   temperature                    单个 0 表示不回退；元组表示结果压缩率过高或
+#                                  平均对数概率过低时依次换更高的温度重解一遍
+#   condition_on_previous_text     是否把上一窗口的文字当提示，关掉可避免复读
+#   no_speech_threshold            无语音概率超过它（且置信度低）的窗口直接跳过
+# 没写的参数用 Whisper 默认值。classic-web、classic-desktop 与加档位之前两个前端
+# 的设置完全一致，在 benchmarks/bench_profiles.py 用人工校对文本测出各档实时率和
+# 字错率之前，两个前端仍以它们为默认。
+DEFAULT_PROFILE = 'classic-web'
+DESKTOP_DEFAULT_PROFILE = 'classic-desktop'
+
+PROFILES = {
+    'classic-web': {
+        'label': '网页原设置',
+        'size': 'small',
+        'options': dict(beam_size=5, best_of=1, temperature=0),
+    },
+    'classic-desktop': {
+        # Whisper 默认：贪心解码，温度 0 ~ 1.0 回退，参考前文，无语音阈值 0.6
+        'label': '桌面原设置',
+        'size': 'base',
+        'options': {},
+    },
+    'fast': {
+        'label': '快速',
+        'size': 'base',
+        'options': dict(beam_size=None, best_of=None, temperature=0.0,
+                        condition_on_previous_text=False, no_speech_threshold=0.5),
+    },
+    'balanced': {
+        'label': '均衡',
+        'size': 'small',
+        'options': dict(beam_size=None, best_of=None, temperature=(0.0, 0.4, 0.8),
+                        condition_on_previous_text=True, no_speech_threshold=0.6),
+    },
+    'accurate': {
+        'label': '精确',
+        'size': 'small',
+        'options': dict(beam_size=5, best_of=5, temperature=(0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+                        condition_on_previous_text=True, no_speech_threshold=0.6),
+    },
+}
+
+
+def get_profile(name):
+    if name not in PROFILES:
+        raise ValueError(f"不支持的解码档位：{name}")
+    return PROFILES[name]
+
+
+def profile_options(name):
+    # 转写参数，同时参与缓存和断点的键，换档位不会取到别的档位的结果。
+    # 不指定 fp16：GPU 上沿用半精度，CPU 上 Whisper 自己退回 float32
+    return dict(task='transcribe', **get_profile(name)['options'])
+
+
+def profile_label(name):
+    profile = get_profile(name)
+    return f"{profile['label']}（{name}，默认 {profile['size']}）"
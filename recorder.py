@@ -0,0 +1,133 @@
+import threading
+
+import numpy as np
+import sounddevice as sd
+import soundfile as sf
+
+
+SFC_UPDATE_HEADER_NOW = 0x1060
+
+
+def _update_header(f):
+    # flush() 只同步数据，RIFF/data 块的长度要单独让 libsndfile 写回文件头
+    sf._snd.sf_command(f._file, SFC_UPDATE_HEADER_NOW, sf._ffi.NULL, 0)
+
+
+# ── 落盘录音 ────────────────────────────────────────────────────
+# 声卡回调只把数据拷进预分配的环形缓冲区，写盘线程再把它增量写进 WAV。
+# 内存占用只和环形缓冲区大小有关，与会议时长无关；写盘线程每秒 flush
+# 一次，并让 libsndfile 立即改写 WAV 头里的长度，程序中途崩溃时已录的
+# 音频在普通播放器里也能正常打开。
+class SpoolRecorder:
+    def __init__(self, path, sample_rate=16000, channels=1, ring_sec=30.0,
+                 flush_sec=1.0, on_chunk=None):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.flush_len = int(flush_sec * sample_rate)
+        self.on_chunk = on_chunk
+
+        self.frames_written = 0
+        # 写盘跟不上时丢掉的块数和帧数，录音里对应位置是空白
+        self.overflows = 0
+        self.dropped_frames = 0
+        self.error = None
+        self._ring = np.zeros((int(ring_sec * sample_rate), channels), dtype='float32')
+        self._write_pos = 0
+        self._read_pos = 0
+        self._stopping = False
+        self._wakeup = threading.Event()
+        self._done = threading.Event()
+        self._stream = None
+        self._writer = None
+
+    @property
+    def duration(self):
+        return self.frames_written / self.sample_rate
+
+    @property
+    def dropped_sec(self):
+        return self.dropped_frames / self.sample_rate
+
+    def start(self):
+        self._file = sf.SoundFile(self.path, 'w', self.sample_rate, self.channels,
+                                  'PCM_16', format='WAV')
+        self._stream = sd.InputStream(samplerate=self.sample_rate, channels=self.channels,
+                                      dtype='float32', callback=self._callback)
+        self._writer = threading.Thread(target=self._drain, daemon=True)
+        self._writer.start()
+        self._stream.start()
+
+    def stop(self):
+        # 只发信号，关流、写尾巴、关文件都在写盘线程里做，界面线程不等待
+        self._stopping = True
+        self._wakeup.set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    @property
+    def finished(self):
+        return self._done.is_set()
+
+    def _callback(self, indata, frames, time, status):
+        size = len(self._ring)
+        if self._write_pos - self._read_pos + frames > size:
+            # 写盘线程跟不上，丢掉这一块而不是覆盖还没写盘的数据
+            self.overflows += 1
+            self.dropped_frames += frames
+            return
+        start = self._write_pos % size
+        end = start + frames
+        if end <= size:
+            self._ring[start:end] = indata
+        else:
+            split = size - start
+            self._ring[start:] = indata[:split]
+            self._ring[:end - size] = indata[split:]
+        self._write_pos += frames
+        self._wakeup.set()
+
+    def _take(self):
+        size = len(self._ring)
+        available = self._write_pos - self._read_pos
+        if not available:
+            return None
+        start = self._read_pos % size
+        end = start + available
+        if end <= size:
+            data = self._ring[start:end].copy()
+        else:
+            data = np.concatenate([self._ring[start:], self._ring[:end - size]])
+        self._read_pos += available
+        return data
+
+    def _drain(self):
+        unflushed = 0
+        try:
+            while True:
+                self._wakeup.wait(0.5)
+                self._wakeup.clear()
+                if self._stopping:
+                    self._stream.stop()
+                    self._stream.close()
+                data = self._take()
+                if data is not None:
+                    self._file.write(data)
+                    self.frames_written += len(data)
+                    unflushed += len(data)
+                    if self.on_chunk:
+                        self.on_chunk(data)
+                    if unflushed >= self.flush_len:
+                        self._file.flush()
+                        _update_header(self._file)
+                        unflushed = 0
+                if self._stopping:
+                    return
+        except Exception as e:
+            self.error = e
+            if self._stream and not self._stream.closed:
+                self._stream.close()
+        finally:
+            self._file.close()
+            self._done.set()
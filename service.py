@@ -0,0 +1,254 @@
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from backends import parse_model_name
+from model_manager import manager, MODEL_SIZES
+from pipeline import load_audio, generate_minutes, transcribe
+
+SAMPLE_RATE = 16000
+MAX_BODY = 200 * 1024 * 1024
+
+
+class BadRequest(ValueError):
+    pass
+
+
+# ── 跨请求批量解码 ──────────────────────────────────────────────
+# 每个请求先去静音，再在安静处切成不超过 30 秒的窗口、算好 log-mel。
+# 同一模型的窗口进入同一个批处理器：凑够 max_batch 个，或者最早的窗口
+# 已经等了 max_wait 秒，就把这一批叠成一个张量，一次编码器前向、一次
+# 批量解码全部算完。短录音很多时 CPU 利用率远高于逐个 model.transcribe。
+# 各窗口独立解码，不带前文提示，也不做温度回退。
+# 批处理器只记模型名，每批解码前向 ModelManager 取模型，不长期持有，
+# 模型被淘汰后照常释放内存，下一批用到时再加载。
+class WindowBatcher:
+    def __init__(self, model_name, max_batch=8, max_wait=0.2, language='zh', beam_size=None):
+        self.model_name = model_name
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.language = language
+        self.beam_size = beam_size
+        self.batches = 0
+        self.windows = 0
+        self._queue = asyncio.Queue()
+        # 模型不是线程安全的，所有解码都在这一个线程里排队执行
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='decode')
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def decode(self, mel):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((mel, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                texts = await loop.run_in_executor(self._executor, self._decode_batch,
+                                                   [mel for mel, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.windows += len(batch)
+            for (_, future), text in zip(batch, texts):
+                if not future.done():
+                    future.set_result(text)
+
+    def _decode_batch(self, mels):
+        import torch
+        import whisper
+        model = manager.get(self.model_name)
+        mel = torch.stack(mels).to(model.device)
+        options = whisper.DecodingOptions(language=self.language, beam_size=self.beam_size,
+                                          without_timestamps=True, fp16=False)
+        with torch.no_grad():
+            results = whisper.decode(model, mel, options)
+        return [r.text.strip() for r in results]
+
+
+def prepare_windows(model, audio):
+    # 在线程池里执行：VAD 去静音，切窗，算 log-mel
+    import whisper
+    from parallel_transcribe import split_windows
+    from vad import detect_speech, SpeechMap
+    speech_map = SpeechMap(detect_speech(audio), len(audio))
+    speech = speech_map.compact(audio)
+    if not len(speech):
+        return [], speech_map.skipped_sec
+    # 目标 24 秒、前后 2 秒内找切点，最后一窗也不超过 30 秒
+    windows = split_windows(speech, window_sec=24, overlap_sec=0, search_sec=2)
+    n_mels = getattr(model.dims, 'n_mels', 80)
+    mels = [whisper.log_mel_spectrogram(whisper.pad_or_trim(speech[start:end]), n_mels)
+            for _, _, start, end in windows]
+    return mels, speech_map.skipped_sec
+
+
+# ── 服务 ────────────────────────────────────────────────────────
+class TranscriptionService:
+    def __init__(self, max_batch=8, max_wait=0.2, batching=True):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batching = batching
+        self.requests = 0
+        self.audio_sec = 0.0
+        self._batchers = {}
+        self._pool = ThreadPoolExecutor(thread_name_prefix='prepare')
+        # 不批量时所有请求串行，作为压测的对照组
+        self._serial = ThreadPoolExecutor(max_workers=1, thread_name_prefix='serial')
+
+    async def _model(self, name):
+        return await asyncio.get_running_loop().run_in_executor(self._pool, manager.get, name)
+
+    async def transcribe(self, audio_bytes, model_name='base'):
+        loop = asyncio.get_running_loop()
+        try:
+            audio = await loop.run_in_executor(self._pool, load_audio, audio_bytes)
+        except Exception as e:
+            raise BadRequest(f"无法解码音频：{e}") from e
+        try:
+            size, _ = parse_model_name(model_name)
+        except ValueError as e:
+            raise BadRequest(str(e)) from e
+        if size not in MODEL_SIZES:
+            raise BadRequest(f"不支持的模型：{model_name}")
+        model = await self._model(model_name)
+        if not self.batching:
+            result = await loop.run_in_executor(
+                self._serial, lambda: transcribe(model, audio, language='zh', fp16=False))
+            text, skipped, windows = result['text'], result['skipped_sec'], None
+        else:
+            batcher = self._batchers.get(model_name)
+            if batcher is None:
+                batcher = self._batchers[model_name] = WindowBatcher(model_name, self.max_batch, self.max_wait)
+            mels, skipped = await loop.run_in_executor(self._pool, prepare_windows, model, audio)
+            del model  # 等待解码期间不持有模型，淘汰后能释放
+            texts = await asyncio.gather(*(batcher.decode(mel) for mel in mels))
+            text, windows = ''.join(texts).strip(), len(mels)
+        self.requests += 1
+        self.audio_sec += len(audio) / SAMPLE_RATE
+        return {'text': text, 'skipped_sec': skipped, 'audio_sec': len(audio) / SAMPLE_RATE,
+                'windows': windows}
+
+    def stats(self):
+        return {
+            'batching': self.batching,
+            'requests': self.requests,
+            'audio_sec': round(self.audio_sec, 1),
+            'batchers': {name: {'batches': b.batches, 'windows': b.windows,
+                                'avg_batch': round(b.windows / b.batches, 2) if b.batches else 0}
+                         for name, b in self._batchers.items()},
+        }
+
+    async def handle(self, method, path, body):
+        url = urlsplit(path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if method == 'GET' and url.path == '/health':
+            return 200, self.stats()
+        if method == 'POST' and url.path in ('/transcribe', '/minutes'):
+            if not body:
+                return 400, {'error': '请求体为空，请直接发送音频文件内容'}
+            started = time.perf_counter()
+            result = await self.transcribe(body, query.get('model', 'base'))
+            if url.path == '/minutes':
+                result['minutes'] = await asyncio.get_running_loop().run_in_executor(
+                    self._pool, generate_minutes, result['text'], query.get('attendees', ''),
+                    query.get('topic', ''), '接口转写')
+            result['elapsed_sec'] = round(time.perf_counter() - started, 3)
+            return 200, result
+        return 404, {'error': f'未知接口：{method} {url.path}'}
+
+
+# ── 最小 HTTP/1.1 ───────────────────────────────────────────────
+# 只用标准库：每个连接一个协程，按 Content-Length 读请求体，支持 keep-alive。
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+           500: 'Internal Server Error'}
+
+
+async def _serve_connection(service, reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, path, _ = request_line.decode('latin-1').split(' ', 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get('content-length', 0))
+            if length > MAX_BODY:
+                status, payload = 413, {'error': '音频文件过大'}
+                body = None
+            else:
+                body = await reader.readexactly(length) if length else b''
+                try:
+                    status, payload = await service.handle(method, path, body)
+                except BadRequest as e:
+                    # 音频解码失败、模型名不对等客户端输入问题；其余异常都算服务端错误
+                    status, payload = 400, {'error': str(e)}
+                except Exception as e:
+                    status, payload = 500, {'error': str(e)}
+            data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            keep_alive = body is not None and headers.get('connection', '').lower() != 'close'
+            writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                         f"Content-Type: application/json; charset=utf-8\r\n"
+                         f"Content-Length: {len(data)}\r\n"
+                         f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host='127.0.0.1', port=8765, preload=('base',), **options):
+    service = TranscriptionService(**options)
+    for name in preload:
+        await service._model(name)
+    server = await asyncio.start_server(lambda r, w: _serve_connection(service, r, w), host, port)
+    mode = f"批量（每批最多 {service.max_batch} 窗，最长等待 {service.max_wait}s）" if service.batching else "逐个"
+    print(f"转写服务已启动：http://{host}:{port}  模式：{mode}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="无界面的会议录音转写服务")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('-m', '--model', nargs='+', default=['base'], help="启动时预加载的模型")
+    parser.add_argument('--max-batch', type=int, default=8, help="每批最多几个 30 秒窗口")
+    parser.add_argument('--max-wait', type=float, default=0.2, help="凑批最长等待（秒）")
+    parser.add_argument('--no-batch', action='store_true', help="关闭批量，逐个请求调用 transcribe")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.model, max_batch=args.max_batch,
+                          max_wait=args.max_wait, batching=not args.no_batch))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+-- 历史记录全文检索：search_text 由应用写入（汉字已切成二元组），
+-- 数据库只负责用 simple 配置生成 tsvector 并建 GIN 索引。
+alter table meeting_minutes add column if not exists search_text text;
+
+alter table meeting_minutes add column if not exists search_vector tsvector
+    generated always as (to_tsvector('simple', coalesce(search_text, ''))) stored;
+
+create index if not exists meeting_minutes_search_idx
+    on meeting_minutes using gin (search_vector);
+
+create index if not exists meeting_minutes_created_at_idx
+    on meeting_minutes (created_at desc);
+
+-- 录音归档：指向服务器本地 audio_archive/ 下的压缩录音和分段索引
+alter table meeting_minutes add column if not exists audio_key text;
@@ -0,0 +1,293 @@
+import atexit
+import datetime
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'meeting_minutes.db')
+
+# 列表页只取元数据，正文在用户展开某条记录时再单独读取
+LIST_COLUMNS = ('id', 'topic', 'attendees', 'source', 'created_at', 'audio_key')
+
+# ── 中文分词 ────────────────────────────────────────────────────
+# Postgres 和 SQLite 自带的分词器都不切中文，这里统一在 Python 里把连续汉字
+# 切成二元组（再补上每段最后一个字，方便单字前缀查询），英文数字按词小写。
+# 建索引和查询用同一套切法，两种存储的搜索结果保持一致。
+_CJK = '㐀-䶿一-鿿豈-﫿'
+_RUN = re.compile(f'([{_CJK}]+)|([^\\W{_CJK}_]+)')
+
+
+def search_text(*fields):
+    tokens = []
+    for field in fields:
+        for cjk, word in _RUN.findall((field or '').lower()):
+            if cjk:
+                tokens.extend(cjk[i:i + 2] for i in range(len(cjk) - 1))
+                tokens.append(cjk[-1])
+            else:
+                tokens.append(word)
+    return ' '.join(tokens)
+
+
+def _query_groups(keyword):
+    # 每段连续汉字是一个短语（二元组须相邻），各段之间是“且”的关系
+    groups = []
+    for cjk, word in _RUN.findall((keyword or '').lower()):
+        if cjk and len(cjk) > 1:
+            groups.append(([cjk[i:i + 2] for i in range(len(cjk) - 1)], False))
+        else:
+            groups.append(([cjk or word], True))
+    return groups
+
+
+def fts5_query(keyword):
+    return ' AND '.join('"' + ' '.join(tokens) + '"' + ('*' if prefix else '')
+                        for tokens, prefix in _query_groups(keyword))
+
+
+def tsquery(keyword):
+    return ' & '.join('(' + ' <-> '.join(tokens) + (':*' if prefix else '') + ')'
+                      for tokens, prefix in _query_groups(keyword))
+
+
+def new_record(topic, attendees, content, source, audio_key=None):
+    topic = topic or "（未填写）"
+    attendees = attendees or "（未填写）"
+    return {
+        "topic": topic,
+        "attendees": attendees,
+        "content": content,
+        "source": source,
+        "created_at": datetime.datetime.now().isoformat(),
+        "search_text": search_text(topic, attendees, content),
+        # 录音归档的键（见 audio_archive.py），没有录音时为空
+        "audio_key": audio_key,
+    }
+
+
+# ── 存储接口 ────────────────────────────────────────────────────
+# 写操作统一表示为 ('save', record) / ('delete', record_id)，由 apply()
+# 成批执行；读操作直接查询。
+class Storage:
+    def apply(self, ops):
+        raise NotImplementedError
+
+    def search(self, keyword='', offset=0, limit=20):
+        raise NotImplementedError
+
+    def get_content(self, record_id):
+        raise NotImplementedError
+
+    def save(self, topic, attendees, content, source, audio_key=None):
+        self.apply([('save', new_record(topic, attendees, content, source, audio_key))])
+
+    def delete(self, record_id, on_deleted=None):
+        self.apply([('delete', record_id)])
+        if on_deleted:
+            on_deleted()
+
+
+# ── Supabase ────────────────────────────────────────────────────
+# 需要先执行 sql/meeting_minutes_search.sql，为表加上 search_text 列、
+# 由它生成的 tsvector 列和 GIN 索引，以及 audio_key 列。
+class SupabaseStorage(Storage):
+    def __init__(self, client):
+        self.client = client
+
+    def apply(self, ops):
+        records = [arg for kind, arg in ops if kind == 'save']
+        deleted = [arg for kind, arg in ops if kind == 'delete']
+        if records:
+            self.client.table("meeting_minutes").insert(records).execute()
+        if deleted:
+            self.client.table("meeting_minutes").delete().in_("id", deleted).execute()
+
+    def search(self, keyword='', offset=0, limit=20):
+        query = self.client.table("meeting_minutes").select(",".join(LIST_COLUMNS), count="exact")
+        if keyword and tsquery(keyword):
+            query = query.text_search("search_vector", tsquery(keyword), options={"config": "simple"})
+        res = query.order("created_at", desc=True).range(offset, offset + limit - 1).execute()
+        return res.data, res.count or 0
+
+    def get_content(self, record_id):
+        res = self.client.table("meeting_minutes").select("content").eq("id", record_id).execute()
+        return res.data[0]["content"] if res.data else ''
+
+    def backfill_search_text(self, batch=200):
+        # 给加索引之前保存的旧记录补上 search_text
+        done = 0
+        while True:
+            res = (self.client.table("meeting_minutes").select("id,topic,attendees,content")
+                   .is_("search_text", "null").limit(batch).execute())
+            if not res.data:
+                return done
+            for r in res.data:
+                self.client.table("meeting_minutes").update({
+                    "search_text": search_text(r.get('topic'), r.get('attendees'), r.get('content'))
+                }).eq("id", r['id']).execute()
+            done += len(res.data)
+
+
+# ── 本地 SQLite ─────────────────────────────────────────────────
+# 开启 WAL，读写互不阻塞；每个线程复用自己的一条连接，不必每次重新打开。
+class SQLiteStorage(Storage):
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS meeting_minutes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    topic TEXT, attendees TEXT, content TEXT, source TEXT, created_at TEXT
+                );
+                CREATE INDEX IF NOT EXISTS meeting_minutes_created_at
+                    ON meeting_minutes (created_at DESC);
+                CREATE VIRTUAL TABLE IF NOT EXISTS meeting_minutes_fts USING fts5(search_text);
+            """)
+            # 早期建的表没有 audio_key 列，补上
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(meeting_minutes)")}
+            if 'audio_key' not in columns:
+                conn.execute("ALTER TABLE meeting_minutes ADD COLUMN audio_key TEXT")
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def apply(self, ops):
+        # 一批写操作放在同一个事务里
+        with self._conn() as conn:
+            for kind, arg in ops:
+                if kind == 'save':
+                    cur = conn.execute(
+                        "INSERT INTO meeting_minutes (topic, attendees, content, source, created_at, audio_key) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (arg['topic'], arg['attendees'], arg['content'], arg['source'], arg['created_at'],
+                         arg.get('audio_key')))
+                    conn.execute("INSERT INTO meeting_minutes_fts (rowid, search_text) VALUES (?, ?)",
+                                 (cur.lastrowid, arg['search_text']))
+                elif kind == 'delete':
+                    conn.execute("DELETE FROM meeting_minutes WHERE id = ?", (arg,))
+                    conn.execute("DELETE FROM meeting_minutes_fts WHERE rowid = ?", (arg,))
+
+    def search(self, keyword='', offset=0, limit=20):
+        columns = ", ".join(f"m.{c}" for c in LIST_COLUMNS)
+        where, params = "", []
+        if keyword and fts5_query(keyword):
+            where = ("WHERE m.id IN (SELECT rowid FROM meeting_minutes_fts "
+                     "WHERE meeting_minutes_fts MATCH ?)")
+            params.append(fts5_query(keyword))
+        conn = self._conn()
+        total = conn.execute(f"SELECT count(*) FROM meeting_minutes m {where}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT {columns} FROM meeting_minutes m {where} "
+            f"ORDER BY m.created_at DESC LIMIT ? OFFSET ?", params + [limit, offset]).fetchall()
+        return [dict(r) for r in rows], total
+
+    def get_content(self, record_id):
+        row = self._conn().execute("SELECT content FROM meeting_minutes WHERE id = ?",
+                                   (record_id,)).fetchone()
+        return row['content'] if row else ''
+
+
+# ── 后台写队列 ──────────────────────────────────────────────────
+# 保存、删除只入队就返回，后台线程把一小段时间内攒下的写操作合成一批提交，
+# 失败按指数退避重试，最终失败的记在 errors 里供界面提示。
+# 还没落库的删除在查询结果里先隐藏掉，界面上立即生效。
+# 进程退出时最多再等 exit_timeout 秒，把队列里的写操作提交完。
+class QueuedStorage:
+    def __init__(self, backend, batch_size=50, batch_wait=0.2, retries=3, backoff=0.5, exit_timeout=10.0):
+        self.backend = backend
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.retries = retries
+        self.backoff = backoff
+        self.errors = deque(maxlen=20)
+        self._queue = queue.Queue()
+        self._pending_deletes = set()
+        self._on_deleted = {}
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.flush, exit_timeout)
+
+    def save(self, topic, attendees, content, source, audio_key=None):
+        self._queue.put(('save', new_record(topic, attendees, content, source, audio_key)))
+
+    def delete(self, record_id, on_deleted=None):
+        # on_deleted 在后台线程里、确认删除成功之后才调用，删除最终失败则不调用
+        self._pending_deletes.add(record_id)
+        if on_deleted:
+            self._on_deleted[record_id] = on_deleted
+        self._queue.put(('delete', record_id))
+
+    def search(self, keyword='', offset=0, limit=20):
+        rows, total = self.backend.search(keyword, offset, limit)
+        hidden = [r for r in rows if r['id'] in self._pending_deletes]
+        return [r for r in rows if r['id'] not in self._pending_deletes], total - len(hidden)
+
+    def get_content(self, record_id):
+        return self.backend.get_content(record_id)
+
+    def pending(self):
+        return self._queue.unfinished_tasks
+
+    def flush(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _run(self):
+        while True:
+            ops = [self._queue.get()]
+            deadline = time.monotonic() + self.batch_wait
+            while len(ops) < self.batch_size:
+                try:
+                    ops.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            self._apply(ops)
+            for kind, arg in ops:
+                if kind == 'delete':
+                    self._pending_deletes.discard(arg)
+                self._queue.task_done()
+
+    def _apply(self, ops):
+        # 保存和删除分开提交、分开重试：Supabase 的插入成功后删除失败时，
+        # 重试只重做删除，不会把已插入的记录再插一遍
+        for kind in ('save', 'delete'):
+            group = [op for op in ops if op[0] == kind]
+            if not group:
+                continue
+            ok = self._apply_group(group)
+            if kind == 'delete':
+                for _, record_id in group:
+                    callback = self._on_deleted.pop(record_id, None)
+                    if ok and callback:
+                        try:
+                            callback()
+                        except Exception as e:
+                            self.errors.append(f"记录 {record_id} 删除后的清理失败：{e}")
+
+    def _apply_group(self, ops):
+        for attempt in range(self.retries + 1):
+            try:
+                self.backend.apply(ops)
+                return True
+            except Exception as e:
+                if attempt == self.retries:
+                    self.errors.append(f"{len(ops)} 条写操作失败：{e}")
+                    return False
+                time.sleep(self.backoff * 2 ** attempt)
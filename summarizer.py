@@ -0,0 +1,94 @@
+import re
+
+import numpy as np
+
+# ── 分句 ────────────────────────────────────────────────────────
+# 一次正则扫描完成分句，句末标点留在句子里
+_SENTENCE = re.compile(r'[^。！？!?；;\n]+[。！？!?；;]*')
+
+
+def split_sentences(text):
+    return [s for s in (m.group().strip() for m in _SENTENCE.finditer(text)) if s]
+
+
+# ── 待办事项 ────────────────────────────────────────────────────
+_ACTION_CUES = re.compile(
+    r'(需要|要求|负责|跟进|落实|安排|推进|完成|提交|确认|整理|准备|对接|'
+    r'下周|明天|后天|本周|月底|之前|截止|尽快|务必|待办|TODO|todo|'
+    r'由.{1,8}(负责|跟进|处理)|请.{1,10}(完成|提供|发|给))')
+
+
+def action_items(sentences, limit=10):
+    seen = set()
+    items = []
+    for s in sentences:
+        if s not in seen and _ACTION_CUES.search(s):
+            seen.add(s)
+            items.append(s)
+            if len(items) >= limit:
+                break
+    return items
+
+
+# ── 要点抽取 ────────────────────────────────────────────────────
+# 每句按字的一元、二元组做 TF-IDF，句子相似度图上跑 TextRank 求中心度。
+# 相似度矩阵 X·Xᵀ 从不显式构造，幂迭代里用两次稀疏矩阵乘向量代替，
+# 一万句的转写稿也能在一秒内算完。
+def _tfidf(sentences):
+    from scipy import sparse
+    lengths = np.fromiter((len(s) for s in sentences), dtype=np.int64, count=len(sentences))
+    codes = np.frombuffer(''.join(sentences).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    owner = np.repeat(np.arange(len(sentences)), lengths)
+
+    # 二元组不能跨句：只保留前后两个字属于同一句的位置
+    same = owner[:-1] == owner[1:]
+    grams = np.concatenate([codes, ((codes[:-1] << np.uint64(21)) | codes[1:])[same] | np.uint64(1 << 63)])
+    rows = np.concatenate([owner, owner[:-1][same]])
+
+    vocab, cols = np.unique(grams, return_inverse=True)
+    X = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(sentences), len(vocab)))
+    X.sum_duplicates()
+    df = np.bincount(X.indices, minlength=len(vocab))
+    X.data = np.log1p(X.data) * np.log((1 + len(sentences)) / (1 + df[X.indices]))
+    norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ X
+
+
+def _textrank(X, damping=0.85, iterations=30, tol=1e-6):
+    n = X.shape[0]
+    # S = X·Xᵀ - I（去掉自相似），行和 d = S·1
+    degree = X @ (X.T @ np.ones(n)) - 1.0
+    degree[degree <= 0] = 1.0
+    rank = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        y = rank / degree
+        new = (1 - damping) / n + damping * (X @ (X.T @ y) - y)
+        if np.abs(new - rank).sum() < tol:
+            return new
+        rank = new
+    return rank
+
+
+def key_points(sentences, limit=15, min_chars=4, redundancy=0.7):
+    if len(sentences) <= limit:
+        return list(sentences)
+    X = _tfidf(sentences)
+    scores = _textrank(X)
+    lengths = np.fromiter((len(s) for s in sentences), dtype=np.int64, count=len(sentences))
+    scores[lengths < min_chars] = -1.0
+
+    # 按得分从高到低挑，和已选句子太像的跳过，最后按原文顺序输出
+    chosen = []
+    for i in np.argsort(-scores)[:limit * 5]:
+        if scores[i] < 0:
+            break
+        if chosen and (X[chosen] @ X[i].T).max() > redundancy:
+            continue
+        chosen.append(int(i))
+        if len(chosen) >= limit:
+            break
+    if not chosen:
+        # 句子都太短、没有一句够格时，和原来一样取开头几句，要点不至于空着
+        return list(sentences[:limit])
+    return [sentences[i] for i in sorted(chosen)]
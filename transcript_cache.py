@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'transcript_cache')
+
+
+def audio_digest(source):
+    # source 可以是 bytes 或文件路径；文件按块读取，不会整个读进内存
+    h = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        h.update(source)
+    else:
+        with open(source, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+    return h.hexdigest()
+
+
+# ── 转写结果缓存 ────────────────────────────────────────────────
+# 以 音频内容哈希 + 模型 + 语言 + 解码参数 为键，把转写文本存成磁盘上的
+# 小 JSON 文件。同一段录音再次转写时直接读缓存；总大小超过上限时按
+# 最近访问时间淘汰。
+class TranscriptCache:
+    def __init__(self, directory=DEFAULT_DIR, max_bytes=200 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, digest, model, language, options=None):
+        settings = json.dumps({'model': model, 'language': language, 'options': options or {}},
+                              sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(f"{digest}|{settings}".encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def get_text(self, key):
+        entry = self.get(key)
+        return entry['text'] if entry else None
+
+    def put(self, key, text, **extra):
+        entry = dict(extra, text=text, created_at=time.time())
+        path = self._path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.directory):
+                if not name.endswith('.json'):
+                    continue
+                try:
+                    st = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, name))
+                total += st.st_size
+            entries.sort()
+            for _, size, name in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+                total -= size
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+cache = TranscriptCache()
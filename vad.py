@@ -0,0 +1,108 @@
+import numpy as np
+
+
+# ── 语音活动检测 ────────────────────────────────────────────────
+# 按 30 ms 分帧，用短时能量（相对噪声底的 dB）和过零率判断是否有人声，
+# 再做前后补边、填小空隙、去掉过短片段。全部是 NumPy 向量运算。
+def detect_speech(audio, sr=16000, frame_sec=0.03, margin_db=10.0, min_db=-55.0,
+                  zcr_range=(0.1, 0.5), pad_sec=0.3, min_silence_sec=0.5, min_speech_sec=0.25):
+    frame_len = int(frame_sec * sr)
+    n_frames = len(audio) // frame_len
+    if n_frames == 0:
+        return [(0, len(audio))] if len(audio) else []
+    frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len)
+
+    db = 10 * np.log10(np.square(frames).mean(axis=1) + 1e-10)
+    zcr = (np.diff(np.signbit(frames), axis=1) != 0).mean(axis=1)
+    # 噪声底取能量最低的 10% 帧，阈值随录音环境自适应
+    threshold = max(np.percentile(db, 10) + margin_db, min_db)
+    voiced = db > threshold
+    # 清辅音能量偏低但过零率高，放宽一点能量要求
+    unvoiced = (db > threshold - margin_db / 2) & (zcr > zcr_range[0]) & (zcr < zcr_range[1])
+    speech = voiced | unvoiced
+
+    speech = _close_gaps(speech, int(round(min_silence_sec / frame_sec)))
+    speech = _drop_short(speech, int(round(min_speech_sec / frame_sec)))
+    pad = int(round(pad_sec / frame_sec))
+    if pad:
+        speech = np.convolve(speech, np.ones(2 * pad + 1), mode='same') > 0
+
+    starts, ends = _runs(speech)
+    regions = [(int(s) * frame_len, int(e) * frame_len) for s, e in zip(starts, ends)]
+    if regions and ends[-1] == n_frames:
+        # 最后不足一帧的尾巴跟着最后一段走
+        regions[-1] = (regions[-1][0], len(audio))
+    return regions
+
+
+def _runs(mask):
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _close_gaps(mask, max_gap):
+    starts, ends = _runs(~mask)
+    mask = mask.copy()
+    for s, e in zip(starts, ends):
+        if 0 < s and e < len(mask) and e - s < max_gap:
+            mask[s:e] = True
+    return mask
+
+
+def _drop_short(mask, min_len):
+    starts, ends = _runs(mask)
+    mask = mask.copy()
+    for s, e in zip(starts, ends):
+        if e - s < min_len:
+            mask[s:e] = False
+    return mask
+
+
+# ── 时间轴映射 ──────────────────────────────────────────────────
+# 只把语音片段拼起来送给模型，片段之间留一小段静音，避免前后两句粘连。
+# 记录每个片段在压缩音频和原始音频里的起点，用来把模型给出的时间换回原始时间。
+class SpeechMap:
+    def __init__(self, regions, total_len, sr=16000, gap_sec=0.2):
+        self.sr = sr
+        self.total_len = total_len
+        self.gap = int(gap_sec * sr)
+        self.regions = regions
+        lengths = np.array([e - s for s, e in regions], dtype=np.int64)
+        self.compact_starts = np.concatenate([[0], np.cumsum(lengths + self.gap)[:-1]]) \
+            if len(regions) else np.zeros(0, dtype=np.int64)
+        self.orig_starts = np.array([s for s, _ in regions], dtype=np.int64)
+        self.lengths = lengths
+
+    @property
+    def speech_sec(self):
+        return float(self.lengths.sum()) / self.sr
+
+    @property
+    def skipped_sec(self):
+        return (self.total_len - float(self.lengths.sum())) / self.sr
+
+    def compact(self, audio):
+        if not self.regions:
+            return np.zeros(0, dtype='float32')
+        gap = np.zeros(self.gap, dtype='float32')
+        parts = []
+        for s, e in self.regions:
+            parts.append(audio[s:e])
+            parts.append(gap)
+        return np.concatenate(parts[:-1]).astype('float32', copy=False)
+
+    def to_original(self, t):
+        # t 为压缩音频上的秒数，可以是标量或数组
+        samples = np.asarray(t, dtype=np.float64) * self.sr
+        if not len(self.regions):
+            return np.asarray(t, dtype=np.float64)
+        idx = np.clip(np.searchsorted(self.compact_starts, samples, side='right') - 1, 0, None)
+        offset = np.minimum(samples - self.compact_starts[idx], self.lengths[idx])
+        return (self.orig_starts[idx] + offset) / self.sr
+
+    def remap_segments(self, segments):
+        if not segments:
+            return segments
+        starts = self.to_original([seg['start'] for seg in segments])
+        ends = self.to_original([seg['end'] for seg in segments])
+        return [dict(seg, start=float(s), end=float(e)) for seg, s, e in zip(segments, starts, ends)]